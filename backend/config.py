@@ -19,16 +19,39 @@ if DB_MODE == "postgres":
         f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}"
         f"@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
     )
+    DATABASE_URL_RO = DATABASE_URL
 else:
     _db_path = Path(os.getenv("SQLITE_PATH", "./storage/inspection.db")).resolve()
     _db_path.parent.mkdir(parents=True, exist_ok=True)
     DATABASE_URL = f"sqlite:///{_db_path}"
+    # Read-only URI connection for the reader pool
+    DATABASE_URL_RO = f"sqlite:///file:{_db_path}?mode=ro&uri=true"
+
+# Inspection inserts are group-committed: up to INSERT_BATCH_MAX rows per
+# transaction, waiting at most INSERT_BATCH_WINDOW_MS for more to arrive.
+INSERT_BATCH_MAX = int(os.getenv("INSERT_BATCH_MAX", "32"))
+INSERT_BATCH_WINDOW_MS = float(os.getenv("INSERT_BATCH_WINDOW_MS", "5"))
+
+# Seconds a /dashboard/metrics payload is reused (dropped early on writes)
+DASHBOARD_CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL", "2"))
 
 API_HOST = os.getenv("API_HOST", "0.0.0.0")
 API_PORT = int(os.getenv("API_PORT", "8000"))
 
 IMAGE_STORAGE_PATH = Path(os.getenv("IMAGE_STORAGE_PATH", "./storage/images"))
 IMAGE_STORAGE_PATH.mkdir(parents=True, exist_ok=True)
+JPEG_QUALITY = int(os.getenv("JPEG_QUALITY", "85"))
+# Frame-rate cap for the MJPEG /cameras/{id}/stream preview
+STREAM_MAX_FPS = float(os.getenv("STREAM_MAX_FPS", "15"))
+# Uploads larger than this (longest side, px) are decoded at 1/2, 1/4 or 1/8
+# scale, never below this size.  0 disables reduced decoding.
+UPLOAD_MAX_DIM = int(os.getenv("UPLOAD_MAX_DIM", "2048"))
+# Longest side (px) of the ?size=thumb previews shown on review cards
+THUMB_MAX_DIM = int(os.getenv("THUMB_MAX_DIM", "256"))
 
 ONNX_MODEL_PATH = os.getenv("ONNX_MODEL_PATH", "./models/defect_model.onnx")
 INFERENCE_MODE = os.getenv("INFERENCE_MODE", "opencv")  # "opencv" or "onnx"
+# Concurrent ONNX inferences are micro-batched: up to ONNX_BATCH_SIZE frames
+# per run, waiting at most ONNX_BATCH_WINDOW_MS.  Needs a dynamic batch dim.
+ONNX_BATCH_SIZE = int(os.getenv("ONNX_BATCH_SIZE", "16"))
+ONNX_BATCH_WINDOW_MS = float(os.getenv("ONNX_BATCH_WINDOW_MS", "5"))
@@ -1,26 +1,63 @@
+import os
+import uuid
+
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
-from backend.config import DATABASE_URL, DB_MODE
+from backend.config import DATABASE_URL, DATABASE_URL_RO, DB_MODE
 
 connect_args = {}
 if DB_MODE == "sqlite":
     connect_args["check_same_thread"] = False
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=(DB_MODE == "postgres"), connect_args=connect_args)
+# SQLite allows many concurrent readers but only one writer, so writes go
+# through a single-connection pool and reads through a separate read-only
+# pool that never queues behind a write lock.  Postgres shares one engine.
+if DB_MODE == "sqlite":
+    write_engine = create_engine(
+        DATABASE_URL, pool_size=1, max_overflow=0, connect_args=connect_args,
+    )
+    read_engine = create_engine(
+        DATABASE_URL_RO, pool_size=max(4, os.cpu_count() or 1), connect_args=connect_args,
+    )
+else:
+    write_engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+    read_engine = write_engine
+
+# Tune SQLite for a server workload: WAL for concurrent reads, fewer fsyncs
+# per commit, a 20MB page cache, in-memory temp tables, a 256MB mmap window
+# and a busy timeout so concurrent writers wait instead of failing with
+# SQLITE_BUSY.  foreign_keys stays off: uploads use a sentinel camera_id
+# that has no row in `cameras`.
+_SQLITE_READ_PRAGMAS = """
+PRAGMA busy_timeout=5000;
+PRAGMA cache_size=-20000;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+"""
+_SQLITE_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+""" + _SQLITE_READ_PRAGMAS
 
-# Enable WAL mode for SQLite (better concurrent reads)
 if DB_MODE == "sqlite":
-    @event.listens_for(engine, "connect")
+    @event.listens_for(write_engine, "connect")
     def _set_sqlite_pragma(dbapi_conn, connection_record):
         cursor = dbapi_conn.cursor()
-        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.executescript(_SQLITE_PRAGMAS)
         cursor.close()
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    @event.listens_for(read_engine, "connect")
+    def _set_sqlite_read_pragma(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        cursor.executescript(_SQLITE_READ_PRAGMAS)
+        cursor.close()
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=write_engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 Base = declarative_base()
 
 
-def get_db():
+def get_db_rw():
     db = SessionLocal()
     try:
         yield db
@@ -28,7 +65,60 @@ def get_db():
         db.close()
 
 
+def get_db_ro():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# GUID columns that older SQLite databases stored as CHAR(36) text
+_GUID_COLUMNS = (("cameras", "id"), ("inspections", "id"), ("inspections", "camera_id"))
+
+
+def _migrate_sqlite_guids(conn):
+    """One-time conversion of text UUIDs to the 16-byte form GUID now binds."""
+    for table, column in _GUID_COLUMNS:
+        rows = conn.exec_driver_sql(
+            f"SELECT DISTINCT {column} FROM {table} WHERE typeof({column}) = 'text'"
+        ).all()
+        if rows:
+            conn.exec_driver_sql(
+                f"UPDATE {table} SET {column} = ? WHERE {column} = ?",
+                [(uuid.UUID(v).bytes, v) for (v,) in rows],
+            )
+
+
+# Defect counts across all fail inspections, kept as a view so the dashboard
+# issues one short fixed statement instead of the full json aggregation.
+_DEFECT_BREAKDOWN_VIEW = {
+    "sqlite": (
+        "CREATE VIEW IF NOT EXISTS v_defect_breakdown AS "
+        "SELECT COALESCE(json_extract(je.value, '$.type'), 'unknown') AS defect_type, "
+        "COUNT(*) AS n "
+        "FROM inspections, json_each(inspections.defects) AS je "
+        "WHERE inspections.result = 'fail' GROUP BY defect_type"
+    ),
+    "postgresql": (
+        "CREATE OR REPLACE VIEW v_defect_breakdown AS "
+        "SELECT COALESCE(je.value ->> 'type', 'unknown') AS defect_type, "
+        "COUNT(*) AS n "
+        "FROM inspections, json_array_elements(inspections.defects) AS je "
+        "WHERE inspections.result = 'fail' GROUP BY defect_type"
+    ),
+}
+
+
 def init_db():
-    """Create all tables."""
+    """Create all tables, plus any indexes missing from existing tables."""
     from backend.models import db_models  # noqa: F401 — registers models
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=write_engine)
+    # create_all only adds indexes together with new tables
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=write_engine, checkfirst=True)
+    with write_engine.begin() as conn:
+        if DB_MODE == "sqlite":
+            _migrate_sqlite_guids(conn)
+        conn.exec_driver_sql(_DEFECT_BREAKDOWN_VIEW[write_engine.dialect.name])
@@ -5,8 +5,9 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
-from backend.config import API_HOST, API_PORT
+from backend.config import API_HOST, API_PORT, INFERENCE_MODE, ONNX_MODEL_PATH
 from backend.database import init_db
 from backend.routes import cameras, inspections, dashboard
 
@@ -15,8 +16,17 @@ from backend.routes import cameras, inspections, dashboard
 async def lifespan(app: FastAPI):
     # Startup: create tables if they don't exist
     init_db()
+    # Load the default inspector now so the first request doesn't pay for it
+    from backend.services.inference import get_inspector
+    try:
+        get_inspector(INFERENCE_MODE, ONNX_MODEL_PATH)
+    except (RuntimeError, FileNotFoundError):
+        pass  # surfaced again on the first request that needs this mode
+    from backend.services.insert_queue import insert_queue
+    insert_queue.start()
     yield
-    # Shutdown: release cameras
+    # Shutdown: stop the insert batcher, release cameras
+    await insert_queue.stop()
     from backend.services.camera_manager import camera_manager
     camera_manager.close_all()
 
@@ -25,6 +35,7 @@ app = FastAPI(
     title="Visual Inspection MVP",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
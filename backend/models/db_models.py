@@ -2,8 +2,10 @@ import uuid
 from datetime import datetime, timezone
 
 from sqlalchemy import (
-    Column, String, Integer, Float, DateTime, Text, JSON, ForeignKey, TypeDecorator,
+    Column, String, Integer, Float, DateTime, Text, JSON, ForeignKey, Index, LargeBinary,
+    TypeDecorator,
 )
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import relationship
 
 from backend.database import Base
@@ -11,19 +13,36 @@ from backend.database import Base
 
 # Portable UUID column — works with both PostgreSQL and SQLite
 class GUID(TypeDecorator):
-    """Platform-independent UUID type. Stores as CHAR(36) on SQLite."""
-    impl = String(36)
+    """
+    Platform-independent UUID type.
+
+    Native UUID on PostgreSQL, 16 raw bytes on SQLite (half the size of the
+    CHAR(36) text form in every PK / FK index).  The application always sees
+    canonical UUID strings.
+    """
+    impl = LargeBinary(16)
     cache_ok = True
 
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=True))
+        return dialect.type_descriptor(LargeBinary(16))
+
     def process_bind_param(self, value, dialect):
-        if value is not None:
-            return str(value)
-        return value
+        if value is None:
+            return value
+        try:
+            value = value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+        except ValueError:
+            return None  # malformed id — matches no row
+        return value if dialect.name == "postgresql" else value.bytes
 
     def process_result_value(self, value, dialect):
-        if value is not None:
+        if value is None or isinstance(value, str):
+            return value
+        if isinstance(value, uuid.UUID):
             return str(value)
-        return value
+        return str(uuid.UUID(bytes=value))
 
 
 def _utcnow():
@@ -51,6 +70,10 @@ class Camera(Base):
 
     inspections = relationship("Inspection", back_populates="camera")
 
+    __table_args__ = (
+        Index("ix_cam_status", "status"),
+    )
+
 
 class Inspection(Base):
     __tablename__ = "inspections"
@@ -67,3 +90,25 @@ class Inspection(Base):
     created_at = Column(DateTime(), default=_utcnow)
 
     camera = relationship("Camera", back_populates="inspections")
+
+    # Match the hot filters (result / camera_id) + ORDER BY created_at DESC
+    __table_args__ = (
+        Index("ix_insp_result_created", result, created_at.desc()),
+        Index("ix_insp_cam_created", camera_id, created_at.desc()),
+        Index("ix_insp_created", created_at),
+    )
+
+
+# Columns exposed as CameraOut / InspectionOut — for list queries that skip
+# ORM hydration
+CAMERA_OUT_COLUMNS = (
+    Camera.id, Camera.name, Camera.source_type, Camera.source_uri,
+    Camera.roi_x, Camera.roi_y, Camera.roi_w, Camera.roi_h,
+    Camera.status, Camera.created_at, Camera.updated_at,
+)
+
+INSPECTION_OUT_COLUMNS = (
+    Inspection.id, Inspection.camera_id, Inspection.image_path, Inspection.result,
+    Inspection.defects, Inspection.confidence, Inspection.inference_mode,
+    Inspection.notes, Inspection.label, Inspection.created_at,
+)
@@ -63,6 +63,10 @@ class InspectionLabelUpdate(BaseModel):
     label: str  # "ok" | "ng"
 
 
+class InspectionLabelItem(InspectionLabelUpdate):
+    id: str
+
+
 # ---------- Dashboard ----------
 class DashboardMetrics(BaseModel):
     total_inspections: int
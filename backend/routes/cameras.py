@@ -3,37 +3,47 @@
 """
 from __future__ import annotations
 
-import base64
+import asyncio
+import time
 from datetime import datetime, timezone
 
-import cv2
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import delete, select, update
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from backend.database import get_db
-from backend.models.db_models import Camera
+from backend.config import JPEG_QUALITY, STREAM_MAX_FPS
+from backend.database import get_db_ro, get_db_rw
+from backend.models.db_models import CAMERA_OUT_COLUMNS, Camera
 from backend.models.schemas import CameraCreate, CameraUpdate, CameraOut
+from backend.routes.dashboard import invalidate_metrics_cache
 from backend.services.camera_manager import camera_manager
 
 router = APIRouter(prefix="/cameras", tags=["cameras"])
 
+_MJPEG_BOUNDARY = "frame"
+
 
 @router.get("", response_model=list[CameraOut])
-def list_cameras(db: Session = Depends(get_db)):
-    return db.query(Camera).order_by(Camera.created_at.desc()).all()
+def list_cameras(db: Session = Depends(get_db_ro)):
+    # Plain rows straight to orjson — no ORM hydration or response_model pass
+    q = select(*CAMERA_OUT_COLUMNS).order_by(Camera.created_at.desc())
+    return ORJSONResponse([dict(r) for r in db.execute(q).mappings()])
 
 
 @router.post("", response_model=CameraOut, status_code=201)
-def create_camera(body: CameraCreate, db: Session = Depends(get_db)):
+def create_camera(body: CameraCreate, db: Session = Depends(get_db_rw)):
     cam = Camera(**body.model_dump())
     db.add(cam)
     db.commit()
     db.refresh(cam)
+    invalidate_metrics_cache()
     return cam
 
 
 @router.get("/{camera_id}", response_model=CameraOut)
-def get_camera(camera_id: str, db: Session = Depends(get_db)):
+def get_camera(camera_id: str, db: Session = Depends(get_db_ro)):
     cam = db.query(Camera).filter(Camera.id == camera_id).first()
     if not cam:
         raise HTTPException(404, "Camera not found")
@@ -41,33 +51,40 @@ def get_camera(camera_id: str, db: Session = Depends(get_db)):
 
 
 @router.patch("/{camera_id}", response_model=CameraOut)
-def update_camera(camera_id: str, body: CameraUpdate, db: Session = Depends(get_db)):
-    cam = db.query(Camera).filter(Camera.id == camera_id).first()
+def update_camera(camera_id: str, body: CameraUpdate, db: Session = Depends(get_db_rw)):
+    # Single UPDATE ... RETURNING instead of SELECT + UPDATE + refresh
+    values = body.model_dump(exclude_unset=True)
+    values["updated_at"] = datetime.now(timezone.utc)
+    cam = db.execute(
+        update(Camera).where(Camera.id == camera_id).values(**values).returning(Camera)
+    ).scalar_one_or_none()
     if not cam:
         raise HTTPException(404, "Camera not found")
-    for field, value in body.model_dump(exclude_unset=True).items():
-        setattr(cam, field, value)
-    cam.updated_at = datetime.now(timezone.utc)
+    out = CameraOut.model_validate(cam)  # before commit expires the row
     db.commit()
-    db.refresh(cam)
-    return cam
+    invalidate_metrics_cache()
+    return out
 
 
 @router.delete("/{camera_id}", status_code=204)
-def delete_camera(camera_id: str, db: Session = Depends(get_db)):
-    cam = db.query(Camera).filter(Camera.id == camera_id).first()
-    if not cam:
+def delete_camera(camera_id: str, db: Session = Depends(get_db_rw)):
+    deleted = db.execute(
+        delete(Camera).where(Camera.id == camera_id).returning(Camera.id)
+    ).scalar_one_or_none()
+    if deleted is None:
         raise HTTPException(404, "Camera not found")
-    camera_manager.close(str(cam.id))
-    db.delete(cam)
     db.commit()
+    invalidate_metrics_cache()
+    camera_manager.close(str(deleted))
 
 
 # ---------- Snapshot -------------------------------------------------------
 
 @router.get("/{camera_id}/snapshot")
-def snapshot(camera_id: str, db: Session = Depends(get_db)):
-    """Return a JPEG snapshot as base64 (easy to embed in Streamlit)."""
+def snapshot(camera_id: str, db: Session = Depends(get_db_ro)):
+    """Return a JPEG snapshot; frame size is in the X-Width / X-Height headers."""
+    import cv2
+
     cam = db.query(Camera).filter(Camera.id == camera_id).first()
     if not cam:
         raise HTTPException(404, "Camera not found")
@@ -79,6 +96,54 @@ def snapshot(camera_id: str, db: Session = Depends(get_db)):
     if frame is None:
         raise HTTPException(503, "Could not capture frame from camera")
 
-    _, buf = cv2.imencode(".jpg", frame)
-    b64 = base64.b64encode(buf.tobytes()).decode()
-    return {"image_base64": b64, "width": frame.shape[1], "height": frame.shape[0]}
+    _, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+    return Response(
+        content=buf.tobytes(),
+        media_type="image/jpeg",
+        headers={"X-Width": str(frame.shape[1]), "X-Height": str(frame.shape[0])},
+    )
+
+
+@router.get("/{camera_id}/stream")
+def stream(camera_id: str, db: Session = Depends(get_db_ro)):
+    """Live MJPEG preview (multipart/x-mixed-replace) — usable directly as an <img> src."""
+    cam = db.query(Camera).filter(Camera.id == camera_id).first()
+    if not cam:
+        raise HTTPException(404, "Camera not found")
+
+    roi = (cam.roi_x, cam.roi_y, cam.roi_w, cam.roi_h)
+    return StreamingResponse(
+        _mjpeg_frames(str(cam.id), cam.source_type, cam.source_uri, roi),
+        media_type=f"multipart/x-mixed-replace; boundary={_MJPEG_BOUNDARY}",
+    )
+
+
+def _next_jpeg(camera_id: str, source_type: str, source_uri: str, after: int, roi: tuple):
+    """Wait for a frame newer than `after` and encode it; (None, after) if the camera is gone."""
+    import cv2
+
+    frame, seq = camera_manager.frame_after(camera_id, source_type, source_uri, after, roi=roi)
+    if frame is None:
+        return None, after
+    _, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+    return buf.tobytes(), seq
+
+
+async def _mjpeg_frames(camera_id: str, source_type: str, source_uri: str, roi: tuple):
+    """
+    Yield each new grabber frame as a JPEG part, at most STREAM_MAX_FPS per
+    second.  Only the frame wait and the encode run in the threadpool; the
+    pacing sleep doesn't hold one of its tokens per open preview.
+    """
+    interval = 1.0 / STREAM_MAX_FPS
+    seq = 0
+    while True:
+        started = time.monotonic()
+        jpeg, seq = await run_in_threadpool(_next_jpeg, camera_id, source_type, source_uri, seq, roi)
+        if jpeg is None:
+            return  # camera gone — end the stream; the client may reconnect
+        yield (
+            f"--{_MJPEG_BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+            f"Content-Length: {len(jpeg)}\r\n\r\n"
+        ).encode() + jpeg + b"\r\n"
+        await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
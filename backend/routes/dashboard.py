@@ -3,50 +3,70 @@
 """
 from __future__ import annotations
 
-from collections import Counter
+import time
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import case, func, select, text
 from sqlalchemy.orm import Session
 
-from backend.database import get_db
-from backend.models.db_models import Camera, Inspection
-from backend.models.schemas import DashboardMetrics, InspectionOut
+from backend.config import DASHBOARD_CACHE_TTL
+from backend.database import get_db_ro
+from backend.models.db_models import INSPECTION_OUT_COLUMNS, Camera, Inspection
+from backend.models.schemas import DashboardMetrics
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
+# Last computed payload — the dashboard polls far more often than data changes
+_metrics_cache: dict = {"ts": 0.0, "payload": None}
+
+
+def invalidate_metrics_cache() -> None:
+    """Drop the cached metrics; call after inserting inspections or changing cameras."""
+    _metrics_cache["payload"] = None
+
+
+# Aggregated by the v_defect_breakdown view created in init_db()
+_DEFECT_BREAKDOWN_SQL = text("SELECT defect_type, n FROM v_defect_breakdown")
+
 
 @router.get("/metrics", response_model=DashboardMetrics)
-def dashboard_metrics(db: Session = Depends(get_db)):
-    total = db.query(Inspection).count()
-    pass_count = db.query(Inspection).filter(Inspection.result == "pass").count()
-    fail_count = db.query(Inspection).filter(Inspection.result == "fail").count()
-    pass_rate = (pass_count / total * 100) if total > 0 else 0.0
+def dashboard_metrics(db: Session = Depends(get_db_ro)):
+    payload = _metrics_cache["payload"]
+    if payload is not None and time.monotonic() - _metrics_cache["ts"] < DASHBOARD_CACHE_TTL:
+        return ORJSONResponse(payload)
 
-    cameras_total = db.query(Camera).count()
-    cameras_active = db.query(Camera).filter(Camera.status == "active").count()
+    # All counters in one round-trip
+    total, pass_count, fail_count, cameras_total, cameras_active = db.execute(
+        select(
+            func.count(Inspection.id),
+            func.coalesce(func.sum(case((Inspection.result == "pass", 1), else_=0)), 0),
+            func.coalesce(func.sum(case((Inspection.result == "fail", 1), else_=0)), 0),
+            select(func.count(Camera.id)).scalar_subquery(),
+            select(func.count(Camera.id)).where(Camera.status == "active").scalar_subquery(),
+        )
+    ).one()
+    pass_rate = (pass_count / total * 100) if total > 0 else 0.0
 
-    recent = (
-        db.query(Inspection)
+    recent = db.execute(
+        select(*INSPECTION_OUT_COLUMNS)
         .order_by(Inspection.created_at.desc())
         .limit(10)
-        .all()
-    )
-
-    # Defect breakdown across all fail inspections
-    fails = db.query(Inspection).filter(Inspection.result == "fail").all()
-    defect_counter: Counter[str] = Counter()
-    for insp in fails:
-        if insp.defects:
-            for d in insp.defects:
-                defect_counter[d.get("type", "unknown")] += 1
-
-    return DashboardMetrics(
-        total_inspections=total,
-        pass_count=pass_count,
-        fail_count=fail_count,
-        pass_rate=round(pass_rate, 2),
-        cameras_active=cameras_active,
-        cameras_total=cameras_total,
-        recent_inspections=[InspectionOut.model_validate(r) for r in recent],
-        defect_breakdown=dict(defect_counter),
-    )
+    ).mappings().all()
+
+    defect_breakdown = dict(db.execute(_DEFECT_BREAKDOWN_SQL).all())
+
+    # Shaped like DashboardMetrics but serialised directly, skipping validation
+    payload = {
+        "total_inspections": total,
+        "pass_count": pass_count,
+        "fail_count": fail_count,
+        "pass_rate": round(pass_rate, 2),
+        "cameras_active": cameras_active,
+        "cameras_total": cameras_total,
+        "recent_inspections": [dict(r) for r in recent],
+        "defect_breakdown": defect_breakdown,
+    }
+    _metrics_cache["ts"] = time.monotonic()
+    _metrics_cache["payload"] = payload
+    return ORJSONResponse(payload)
@@ -4,110 +4,260 @@
 from __future__ import annotations
 
 import base64
+import io
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
-import cv2
-import numpy as np
+import anyio
 from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi.responses import FileResponse, ORJSONResponse, Response, StreamingResponse
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from backend.config import IMAGE_STORAGE_PATH, INFERENCE_MODE, ONNX_MODEL_PATH
-from backend.database import get_db
-from backend.models.db_models import Camera, Inspection
-from backend.models.schemas import InspectionOut, InspectionLabelUpdate
+from backend.config import (
+    IMAGE_STORAGE_PATH, INFERENCE_MODE, JPEG_QUALITY, ONNX_MODEL_PATH, THUMB_MAX_DIM,
+    UPLOAD_MAX_DIM,
+)
+from backend.database import get_db_ro, get_db_rw
+from backend.models.db_models import (
+    INSPECTION_OUT_COLUMNS, Camera, Inspection, _new_uuid, _utcnow,
+)
+from backend.models.schemas import InspectionLabelItem, InspectionLabelUpdate, InspectionOut
+from backend.routes.dashboard import invalidate_metrics_cache
 from backend.services.camera_manager import camera_manager
-from backend.services.inference import get_inspector
+from backend.services.insert_queue import insert_queue
 
 router = APIRouter(prefix="/inspections", tags=["inspections"])
 
+# camera_id stored for uploaded images (no camera involved)
+UPLOAD_CAMERA_ID = "00000000-0000-0000-0000-000000000000"
+
+# Stored image suffixes and the media types they are served as; an upload's
+# suffix comes from its magic bytes, never from the client's filename
+_IMAGE_MEDIA_TYPES = {
+    ".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".png": "image/png", ".bmp": "image/bmp",
+}
+_IMAGE_MAGIC = ((b"\xff\xd8\xff", ".jpg"), (b"\x89PNG\r\n\x1a\n", ".png"), (b"BM", ".bmp"))
+_NOSNIFF = {"X-Content-Type-Options": "nosniff"}
+# 200 UUIDs keep /images URLs near 7.5 KB, well inside server line limits
+_IMAGES_MAX_IDS = 200
+
+# Read size for streamed base64 — a multiple of 3 (and of 57, one MIME
+# line), so each chunk encodes without padding and chunks concatenate.
+_B64_CHUNK = 57 * 1024
+
+
+def _save_image(path: Path, frame) -> None:
+    """Encode in memory (JPEG at JPEG_QUALITY, no Huffman optimisation) and write."""
+    import cv2
+
+    params = [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY, cv2.IMWRITE_JPEG_OPTIMIZE, 0]
+    ok, buf = cv2.imencode(path.suffix or ".jpg", frame, params)
+    if not ok:
+        raise HTTPException(500, "Could not encode image")
+    path.write_bytes(buf.tobytes())
+
+
+def _thumbnail(path: Path) -> Optional[bytes]:
+    """JPEG preview of a stored image, longest side at most THUMB_MAX_DIM.
+
+    Files Pillow rejects (e.g. truncated JPEGs OpenCV accepted at upload)
+    are decoded with OpenCV instead; None if neither can read the file.
+    """
+    from PIL import Image
+
+    box = (THUMB_MAX_DIM, THUMB_MAX_DIM)
+    try:
+        with Image.open(path) as im:
+            im.draft("RGB", box)  # JPEGs decode straight at a reduced scale
+            thumb = im.convert("RGB")
+        thumb.thumbnail(box)
+        out = io.BytesIO()
+        thumb.save(out, "JPEG", quality=75)
+        return out.getvalue()
+    except (OSError, Image.DecompressionBombError):
+        pass
+
+    import cv2
+
+    frame = cv2.imread(str(path), cv2.IMREAD_COLOR)
+    if frame is None:
+        return None
+    scale = THUMB_MAX_DIM / max(frame.shape[:2])
+    if scale < 1:
+        frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 75])
+    return buf.tobytes() if ok else None
+
+
+def _inspection_row(
+    camera_id, img_path: Path, result, infer_mode: str, notes: str = "", label: str = "",
+) -> dict:
+    """Complete Inspection row (id + timestamps assigned here), ready to queue."""
+    return {
+        "id": _new_uuid(),
+        "camera_id": camera_id,
+        "image_path": str(img_path),
+        "result": result.result_str,
+        "defects": result.to_dicts(),
+        "confidence": result.confidence,
+        "inference_mode": infer_mode,
+        "notes": notes,
+        "label": label,
+        # Naive UTC, the form DateTime() columns read back as, so the POST
+        # response matches later GETs of the same row
+        "created_at": _utcnow().replace(tzinfo=None),
+    }
+
+
+def _capture_and_inspect(
+    db: Session, camera_id: str, infer_mode: str, n: int = 1, label: str = "",
+) -> list[dict]:
+    """Capture `n` distinct consecutive frames, then save and inspect each."""
+    from backend.services.inference import get_inspector
 
-@router.post("", response_model=InspectionOut, status_code=201)
-def run_inspection(
-    camera_id: str,
-    mode: str = Query(default=None, description="opencv or onnx — overrides .env"),
-    db: Session = Depends(get_db),
-):
-    """Capture image from camera, run inference, store result."""
     cam = db.query(Camera).filter(Camera.id == camera_id).first()
     if not cam:
         raise HTTPException(404, "Camera not found")
 
-    # 1. Capture
     roi = (cam.roi_x, cam.roi_y, cam.roi_w, cam.roi_h)
-    frame = camera_manager.snapshot(
-        str(cam.id), cam.source_type, cam.source_uri, roi=roi,
-    )
+    inspector = get_inspector(infer_mode, ONNX_MODEL_PATH)
+    rows, saved = [], []
+    seq = 0
+    try:
+        for _ in range(n):
+            # 1. Capture — each frame newer than the previous one
+            frame, seq = camera_manager.frame_after(
+                str(cam.id), cam.source_type, cam.source_uri, seq, roi=roi,
+            )
+            if frame is None:
+                raise HTTPException(503, "Could not capture frame from camera")
+
+            # 2. Save image
+            ts = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S_%f")
+            filename = f"{cam.id}_{ts}.jpg"
+            img_path = IMAGE_STORAGE_PATH / filename
+            _save_image(img_path, frame)
+            saved.append(img_path)
+
+            # 3. Inference
+            result = inspector.inspect(frame)
+            rows.append(_inspection_row(cam.id, img_path, result, infer_mode, label=label))
+    except BaseException:
+        # No row will reference the frames already written — don't leave them behind
+        for path in saved:
+            path.unlink(missing_ok=True)
+        raise
+    return rows
+
+
+def _upload_reduction(contents: bytes) -> int:
+    """Largest 2/4/8 decode reduction that keeps the long side >= UPLOAD_MAX_DIM."""
+    if UPLOAD_MAX_DIM <= 0:
+        return 1
+    from PIL import Image
+
+    try:
+        # Image.open only parses the header — no pixel decode
+        long_side = max(Image.open(io.BytesIO(contents)).size)
+    except Exception:
+        return 1  # let OpenCV decide whether it can read it
+    factor = 1
+    while factor < 8 and long_side // (factor * 2) >= UPLOAD_MAX_DIM:
+        factor *= 2
+    return factor
+
+
+def _decode_and_inspect(contents: bytes, filename: Optional[str], infer_mode: str) -> dict:
+    import cv2
+    import numpy as np
+    from backend.services.inference import get_inspector
+
+    # 1. Decode uploaded image — oversized ones straight to a reduced size
+    #    inside the decoder (libjpeg skips DCT work) instead of full-res.
+    factor = _upload_reduction(contents)
+    flags = {
+        1: cv2.IMREAD_COLOR, 2: cv2.IMREAD_REDUCED_COLOR_2,
+        4: cv2.IMREAD_REDUCED_COLOR_4, 8: cv2.IMREAD_REDUCED_COLOR_8,
+    }
+    nparr = np.frombuffer(contents, np.uint8)
+    frame = cv2.imdecode(nparr, flags[factor])
     if frame is None:
-        raise HTTPException(503, "Could not capture frame from camera")
+        raise HTTPException(400, "Could not decode image. Supported formats: jpg, png, bmp.")
 
-    # 2. Save image
+    # 2. Save JPEG / PNG / BMP uploads as-is — no re-encode, original
+    #    quality.  Other formats OpenCV reads are stored as a JPEG of the
+    #    decoded frame, so the stored suffix always matches the bytes.
     ts = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S_%f")
-    filename = f"{cam.id}_{ts}.jpg"
-    img_path = IMAGE_STORAGE_PATH / filename
-    cv2.imwrite(str(img_path), frame)
+    ext = next((e for magic, e in _IMAGE_MAGIC if contents.startswith(magic)), None)
+    if ext is not None:
+        img_path = IMAGE_STORAGE_PATH / f"upload_{ts}{ext}"
+        img_path.write_bytes(contents)
+    else:
+        img_path = IMAGE_STORAGE_PATH / f"upload_{ts}.jpg"
+        _save_image(img_path, frame)
+        factor = 1  # stored at the decoded frame's size
 
-    # 3. Inference
-    infer_mode = mode or INFERENCE_MODE
+    # 3. Inference — bboxes reported in the stored image's coordinates
     inspector = get_inspector(infer_mode, ONNX_MODEL_PATH)
     result = inspector.inspect(frame)
+    if factor > 1:
+        result.rescale(factor)
 
-    # 4. Persist
-    inspection = Inspection(
-        camera_id=cam.id,
-        image_path=str(img_path),
-        result=result.result_str,
-        defects=[d.to_dict() for d in result.defects],
-        confidence=result.confidence,
-        inference_mode=infer_mode,
+    # camera_id = "upload" sentinel
+    return _inspection_row(
+        UPLOAD_CAMERA_ID, img_path, result, infer_mode,
+        notes=f"Uploaded file: {filename}",
     )
-    db.add(inspection)
-    db.commit()
-    db.refresh(inspection)
-    return inspection
 
 
-@router.post("/upload", response_model=InspectionOut, status_code=201)
-def upload_and_inspect(
-    file: UploadFile = File(...),
+@router.post("", response_model=InspectionOut, status_code=201)
+async def run_inspection(
+    camera_id: str,
     mode: str = Query(default=None, description="opencv or onnx — overrides .env"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db_ro),
 ):
-    """Upload an image file, run inference, store result (no camera needed)."""
-    # 1. Read uploaded image
-    contents = file.file.read()
-    nparr = np.frombuffer(contents, np.uint8)
-    frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-    if frame is None:
-        raise HTTPException(400, "Could not decode image. Supported formats: jpg, png, bmp.")
+    """Capture image from camera, run inference, store result."""
+    # Capture + inference are blocking, keep them off the event loop
+    [row] = await run_in_threadpool(_capture_and_inspect, db, camera_id, mode or INFERENCE_MODE)
+    # 4. Persist — batched with concurrent inspections, returns once committed
+    await insert_queue.put(row)
+    invalidate_metrics_cache()
+    return row
 
-    # 2. Save image to disk
-    ts = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S_%f")
-    ext = Path(file.filename).suffix if file.filename else ".jpg"
-    filename = f"upload_{ts}{ext}"
-    img_path = IMAGE_STORAGE_PATH / filename
-    cv2.imwrite(str(img_path), frame)
 
-    # 3. Inference
-    infer_mode = mode or INFERENCE_MODE
-    inspector = get_inspector(infer_mode, ONNX_MODEL_PATH)
-    result = inspector.inspect(frame)
+@router.post("/bulk", response_model=list[InspectionOut], status_code=201)
+async def bulk_inspection(
+    camera_id: str,
+    n: int = Query(default=1, ge=1, le=100, description="number of frames to capture"),
+    label: str = Query(default="", description="label (ok/ng) applied to every capture"),
+    mode: str = Query(default=None, description="opencv or onnx — overrides .env"),
+    db: Session = Depends(get_db_ro),
+):
+    """Capture and inspect `n` consecutive frames in one call, optionally pre-labelled."""
+    rows = await run_in_threadpool(
+        _capture_and_inspect, db, camera_id, mode or INFERENCE_MODE, n, label,
+    )
+    await insert_queue.put_many(rows)
+    invalidate_metrics_cache()
+    return rows
+
 
-    # 4. Persist (camera_id = "upload" sentinel)
-    inspection = Inspection(
-        camera_id="00000000-0000-0000-0000-000000000000",
-        image_path=str(img_path),
-        result=result.result_str,
-        defects=[d.to_dict() for d in result.defects],
-        confidence=result.confidence,
-        inference_mode=infer_mode,
-        notes=f"Uploaded file: {file.filename}",
+@router.post("/upload", response_model=InspectionOut, status_code=201)
+async def upload_and_inspect(
+    file: UploadFile = File(...),
+    mode: str = Query(default=None, description="opencv or onnx — overrides .env"),
+):
+    """Upload an image file, run inference, store result (no camera needed)."""
+    contents = await file.read()
+    row = await run_in_threadpool(
+        _decode_and_inspect, contents, file.filename, mode or INFERENCE_MODE,
     )
-    db.add(inspection)
-    db.commit()
-    db.refresh(inspection)
-    return inspection
+    await insert_queue.put(row)
+    invalidate_metrics_cache()
+    return row
 
 
 @router.get("", response_model=list[InspectionOut])
@@ -116,18 +266,48 @@ def list_inspections(
     result: Optional[str] = None,
     limit: int = Query(50, le=500),
     offset: int = 0,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db_ro),
 ):
-    q = db.query(Inspection)
+    # Plain rows straight to orjson — no ORM hydration or response_model pass
+    q = select(*INSPECTION_OUT_COLUMNS)
     if camera_id:
-        q = q.filter(Inspection.camera_id == camera_id)
+        q = q.where(Inspection.camera_id == camera_id)
     if result:
-        q = q.filter(Inspection.result == result)
-    return q.order_by(Inspection.created_at.desc()).offset(offset).limit(limit).all()
+        q = q.where(Inspection.result == result)
+    q = q.order_by(Inspection.created_at.desc()).offset(offset).limit(limit)
+    return ORJSONResponse([dict(r) for r in db.execute(q).mappings()])
+
+
+@router.get("/images")
+def get_inspection_images(
+    ids: str = Query(..., description="comma-separated inspection ids"),
+    size: Optional[str] = Query(default=None, description="'thumb' for downscaled previews"),
+    db: Session = Depends(get_db_ro),
+):
+    """Images for several inspections in one call, as {id: image_base64}.
+
+    Unknown ids, images missing on disk and unreadable thumbnails are left
+    out of the map.  More than _IMAGES_MAX_IDS ids is a 422; clients split
+    larger sets over several calls.
+    """
+    id_list = [i for i in ids.split(",") if i]
+    if len(id_list) > _IMAGES_MAX_IDS:
+        raise HTTPException(422, f"At most {_IMAGES_MAX_IDS} ids per request")
+    rows = db.execute(
+        select(Inspection.id, Inspection.image_path).where(Inspection.id.in_(id_list))
+    ).all()
+    images = {}
+    for iid, image_path in rows:
+        path = Path(image_path)
+        if path.is_file():
+            data = _thumbnail(path) if size == "thumb" else path.read_bytes()
+            if data is not None:  # unreadable files are left out like missing ones
+                images[iid] = base64.b64encode(data).decode("ascii")
+    return ORJSONResponse(images)
 
 
 @router.get("/{inspection_id}", response_model=InspectionOut)
-def get_inspection(inspection_id: str, db: Session = Depends(get_db)):
+def get_inspection(inspection_id: str, db: Session = Depends(get_db_ro)):
     insp = db.query(Inspection).filter(Inspection.id == inspection_id).first()
     if not insp:
         raise HTTPException(404, "Inspection not found")
@@ -135,30 +315,84 @@ def get_inspection(inspection_id: str, db: Session = Depends(get_db)):
 
 
 @router.get("/{inspection_id}/image")
-def get_inspection_image(inspection_id: str, db: Session = Depends(get_db)):
-    """Return inspection image as base64."""
+def get_inspection_image(
+    inspection_id: str,
+    encoding: Optional[str] = Query(
+        default=None, description="'base64' for the legacy {image_base64} JSON body",
+    ),
+    size: Optional[str] = Query(default=None, description="'thumb' for a downscaled preview"),
+    db: Session = Depends(get_db_ro),
+):
+    """Return the stored inspection image file (sent straight from disk)."""
     insp = db.query(Inspection).filter(Inspection.id == inspection_id).first()
     if not insp:
         raise HTTPException(404, "Inspection not found")
     path = Path(insp.image_path)
     if not path.is_file():
         raise HTTPException(404, "Image file not found on disk")
-    with open(path, "rb") as f:
-        b64 = base64.b64encode(f.read()).decode()
-    return {"image_base64": b64}
+    thumb = _thumbnail(path) if size == "thumb" else None
+    if thumb is not None:  # an unreadable file falls back to the original
+        if encoding == "base64":
+            return ORJSONResponse({"image_base64": base64.b64encode(thumb).decode("ascii")})
+        return Response(thumb, media_type="image/jpeg", headers=_NOSNIFF)
+    if encoding == "base64":
+        return StreamingResponse(_base64_json(path), media_type="application/json")
+    # Only image types are served inline as such; anything else stored by
+    # older versions goes out as opaque bytes, and nosniff stops browsers
+    # from guessing otherwise
+    return FileResponse(
+        path,
+        media_type=_IMAGE_MEDIA_TYPES.get(path.suffix.lower(), "application/octet-stream"),
+        filename=path.name,
+        content_disposition_type="inline",
+        headers=_NOSNIFF,
+    )
+
+
+async def _base64_json(path: Path):
+    """Yield {"image_base64": ...} encoding the file chunk by chunk."""
+    yield b'{"image_base64":"'
+    async with await anyio.open_file(path, "rb") as f:
+        while chunk := await f.read(_B64_CHUNK):
+            yield base64.b64encode(chunk)
+    yield b'"}'
+
+
+# One parameterised UPDATE, executed once per label item (executemany)
+_LABEL_UPDATE = (
+    update(Inspection.__table__)
+    .where(Inspection.__table__.c.id == bindparam("b_id"))
+    .values(label=bindparam("b_label"))
+)
+
+
+@router.patch("/labels")
+def label_inspections(body: list[InspectionLabelItem], db: Session = Depends(get_db_rw)):
+    """Several manual labels in one transaction; unknown ids are skipped."""
+    if not body:
+        return {"updated": 0}
+    res = db.execute(_LABEL_UPDATE, [{"b_id": item.id, "b_label": item.label} for item in body])
+    db.commit()
+    invalidate_metrics_cache()  # recent_inspections shows labels
+    return {"updated": res.rowcount}
 
 
 @router.patch("/{inspection_id}/label", response_model=InspectionOut)
 def label_inspection(
     inspection_id: str,
     body: InspectionLabelUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db_rw),
 ):
     """Manual label (ok/ng) for dataset building."""
-    insp = db.query(Inspection).filter(Inspection.id == inspection_id).first()
+    insp = db.execute(
+        update(Inspection)
+        .where(Inspection.id == inspection_id)
+        .values(label=body.label)
+        .returning(Inspection)
+    ).scalar_one_or_none()
     if not insp:
         raise HTTPException(404, "Inspection not found")
-    insp.label = body.label
+    out = InspectionOut.model_validate(insp)  # before commit expires the row
     db.commit()
-    db.refresh(insp)
-    return insp
+    invalidate_metrics_cache()  # recent_inspections shows labels
+    return out
@@ -2,13 +2,27 @@
 Camera manager — handles USB webcams and RTSP IP cameras.
 
 Each camera gets an OpenCV VideoCapture that is opened on-demand and
-cached so repeated snapshot calls don't re-open the stream.
+owned by a background grabber thread, which keeps decoding the stream and
+publishes the newest frame.  Snapshot calls just pick up that frame instead
+of blocking a request thread for a whole frame interval.
 """
 from __future__ import annotations
 
+import itertools
+import sys
 import threading
-import cv2
-import numpy as np
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import cv2
+    import numpy as np
+
+# How long a snapshot waits for a freshly opened stream's first frame
+_FIRST_FRAME_TIMEOUT_S = 5.0
+# Consecutive failed grabs before a grabber gives up and the stream is reopened
+_MAX_GRAB_FAILURES = 50
+_JOIN_TIMEOUT_S = 2.0
 
 
 class CameraManager:
@@ -22,18 +36,28 @@ class CameraManager:
             if cls._instance is None:
                 cls._instance = super().__new__(cls)
                 cls._instance._captures: dict[str, cv2.VideoCapture] = {}
+                # One lock per camera serialises reads on its VideoCapture;
+                # _dict_lock only guards the two dicts themselves.
+                cls._instance._cap_locks: dict[str, threading.Lock] = {}
+                cls._instance._dict_lock = threading.RLock()
+                # Grabber state, also guarded by _dict_lock (via _frame_cond)
+                cls._instance._latest: dict[str, np.ndarray] = {}
+                cls._instance._threads: dict[str, threading.Thread] = {}
+                cls._instance._stops: dict[str, threading.Event] = {}
+                cls._instance._frame_cond = threading.Condition(cls._instance._dict_lock)
+                # Sequence number of each camera's latest frame, drawn from one
+                # counter so it keeps increasing across reopens
+                cls._instance._seq: dict[str, int] = {}
+                cls._instance._seq_counter = itertools.count(1)
+                cls._instance._cv2 = None
         return cls._instance
 
     # ---- public API -------------------------------------------------------
 
     def open(self, camera_id: str, source_type: str, source_uri: str) -> bool:
         """Open (or re-open) a camera. Returns True on success."""
-        self.close(camera_id)
-        cap = self._make_capture(source_type, source_uri)
-        if cap is None or not cap.isOpened():
-            return False
-        self._captures[camera_id] = cap
-        return True
+        with self._get_cap_lock(camera_id):
+            return self._open_locked(camera_id, source_type, source_uri)
 
     def snapshot(
         self,
@@ -43,55 +67,186 @@ class CameraManager:
         roi: tuple[int, int, int, int] | None = None,
     ) -> np.ndarray | None:
         """
-        Grab a single frame.  Opens the camera lazily if needed.
+        Return the newest frame.  Opens the camera lazily if needed.
 
         roi = (x, y, w, h) — applied after capture.  (0,0,0,0) means full frame.
-        """
-        cap = self._captures.get(camera_id)
-        if cap is None or not cap.isOpened():
-            if not self.open(camera_id, source_type, source_uri):
-                return None
-            cap = self._captures[camera_id]
-
-        ok, frame = cap.read()
-        if not ok or frame is None:
-            # try re-opening once (RTSP streams may drop)
-            self.open(camera_id, source_type, source_uri)
-            cap = self._captures.get(camera_id)
-            if cap is None:
-                return None
-            ok, frame = cap.read()
-            if not ok or frame is None:
-                return None
-
-        if roi and roi[2] > 0 and roi[3] > 0:
-            x, y, w, h = roi
-            frame = frame[y : y + h, x : x + w]
 
-        return frame
+        The full frame is shared with other callers and must not be modified
+        in place; an ROI crop is returned as an independent copy.
+        """
+        with self._dict_lock:
+            frame = self._latest.get(camera_id)
+        if frame is None:
+            with self._get_cap_lock(camera_id):
+                if camera_id not in self._threads:
+                    if not self._open_locked(camera_id, source_type, source_uri):
+                        return None
+                frame = self._wait_for_frame(camera_id)
+                if frame is None:
+                    # try re-opening once (RTSP streams may drop)
+                    if not self._open_locked(camera_id, source_type, source_uri):
+                        return None
+                    frame = self._wait_for_frame(camera_id)
+                    if frame is None:
+                        return None
+
+        return self._crop(frame, roi)
+
+    def frame_after(
+        self,
+        camera_id: str,
+        source_type: str,
+        source_uri: str,
+        after: int,
+        roi: tuple[int, int, int, int] | None = None,
+    ) -> tuple[np.ndarray | None, int]:
+        """
+        Wait for a frame newer than sequence number `after` (0 accepts the
+        current one).  Returns (frame, seq); frame is None if the camera
+        can't be opened or no new frame arrives in time.
+        """
+        if self.snapshot(camera_id, source_type, source_uri) is None:
+            return None, after
+        with self._frame_cond:
+            self._frame_cond.wait_for(
+                lambda: self._seq.get(camera_id, 0) > after or camera_id not in self._threads,
+                timeout=_FIRST_FRAME_TIMEOUT_S,
+            )
+            frame = self._latest.get(camera_id)
+            seq = self._seq.get(camera_id, 0)
+        if frame is None or seq <= after:
+            return None, after
+        return self._crop(frame, roi), seq
 
     def close(self, camera_id: str) -> None:
-        cap = self._captures.pop(camera_id, None)
-        if cap is not None:
-            cap.release()
+        # The camera's lock outlives the capture: threads may already be
+        # waiting on it, and a replacement lock would let them race
+        with self._get_cap_lock(camera_id):
+            self._release(camera_id)
 
     def close_all(self) -> None:
-        for cid in list(self._captures.keys()):
+        with self._dict_lock:
+            camera_ids = list(self._threads.keys())
+        for cid in camera_ids:
             self.close(cid)
 
     # ---- helpers -----------------------------------------------------------
 
     @staticmethod
-    def _make_capture(source_type: str, source_uri: str) -> cv2.VideoCapture | None:
+    def _crop(frame: np.ndarray, roi: tuple[int, int, int, int] | None) -> np.ndarray:
+        if roi and roi[2] > 0 and roi[3] > 0:
+            x, y, w, h = roi
+            frame = frame[y : y + h, x : x + w].copy()
+        return frame
+
+    def _get_cap_lock(self, camera_id: str) -> threading.Lock:
+        with self._dict_lock:
+            return self._cap_locks.setdefault(camera_id, threading.Lock())
+
+    def _open_locked(self, camera_id: str, source_type: str, source_uri: str) -> bool:
+        """Body of open(); caller must hold the camera's lock."""
+        self._release(camera_id)
+        cap = self._make_capture(source_type, source_uri)
+        if cap is None or not cap.isOpened():
+            if cap is not None:
+                cap.release()
+            return False
+        stop = threading.Event()
+        thread = threading.Thread(
+            target=self._grab_loop,
+            args=(camera_id, cap, stop),
+            name=f"grab-{camera_id}",
+            daemon=True,
+        )
+        with self._dict_lock:
+            self._captures[camera_id] = cap
+            self._stops[camera_id] = stop
+            self._threads[camera_id] = thread
+        thread.start()
+        return True
+
+    def _release(self, camera_id: str) -> None:
+        """Stop the camera's grabber; the grabber releases the capture itself."""
+        with self._dict_lock:
+            stop = self._stops.pop(camera_id, None)
+            if stop is not None:
+                stop.set()
+            thread = self._threads.pop(camera_id, None)
+            self._captures.pop(camera_id, None)
+            self._latest.pop(camera_id, None)
+            self._seq.pop(camera_id, None)
+        if thread is not None:
+            thread.join(timeout=_JOIN_TIMEOUT_S)
+
+    def _wait_for_frame(self, camera_id: str) -> np.ndarray | None:
+        """Block until the grabber publishes a frame or dies."""
+        with self._frame_cond:
+            self._frame_cond.wait_for(
+                lambda: camera_id in self._latest or camera_id not in self._threads,
+                timeout=_FIRST_FRAME_TIMEOUT_S,
+            )
+            return self._latest.get(camera_id)
+
+    def _grab_loop(self, camera_id: str, cap: cv2.VideoCapture, stop: threading.Event) -> None:
+        failures = 0
+        try:
+            while not stop.is_set():
+                frame = self._read_latest(cap)
+                if frame is None:
+                    failures += 1
+                    if failures >= _MAX_GRAB_FAILURES:
+                        break  # stream dropped — the next snapshot reopens it
+                    time.sleep(0.01)
+                    continue
+                failures = 0
+                with self._frame_cond:
+                    if stop.is_set():
+                        break
+                    self._latest[camera_id] = frame
+                    self._seq[camera_id] = next(self._seq_counter)
+                    self._frame_cond.notify_all()
+        finally:
+            cap.release()
+            with self._frame_cond:
+                if self._stops.get(camera_id) is stop:
+                    # Died on its own rather than via close(): forget it
+                    del self._stops[camera_id]
+                    self._threads.pop(camera_id, None)
+                    self._captures.pop(camera_id, None)
+                    self._latest.pop(camera_id, None)
+                    self._seq.pop(camera_id, None)
+                self._frame_cond.notify_all()
+
+    def _cv(self):
+        """Import cv2 on first use so it stays off the app's startup path."""
+        if self._cv2 is None:
+            import cv2
+            self._cv2 = cv2
+        return self._cv2
+
+    def _make_capture(self, source_type: str, source_uri: str) -> cv2.VideoCapture | None:
+        # Name the backend explicitly to skip OpenCV's auto-probing
+        cv2 = self._cv()
         if source_type == "usb":
             idx = int(source_uri)
-            cap = cv2.VideoCapture(idx)
+            backend = cv2.CAP_V4L2 if sys.platform.startswith("linux") else cv2.CAP_ANY
+            cap = cv2.VideoCapture(idx, backend)
         elif source_type == "rtsp":
-            cap = cv2.VideoCapture(source_uri)
+            cap = cv2.VideoCapture(source_uri, cv2.CAP_FFMPEG)
         else:
             return None
+        # Keep at most one frame queued so reads aren't seconds stale
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
         return cap
 
+    @staticmethod
+    def _read_latest(cap: cv2.VideoCapture) -> np.ndarray | None:
+        """Grab one frame and decode it into a new array."""
+        if not cap.grab():
+            return None
+        ok, frame = cap.retrieve()
+        return frame if ok else None
+
 
 # Module-level convenience instance
 camera_manager = CameraManager()
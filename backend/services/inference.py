@@ -15,19 +15,65 @@ Inference engine — two modes:
 """
 from __future__ import annotations
 
+import functools
 import math
 import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import List
+from types import SimpleNamespace
+from typing import List, Tuple
 
 import cv2
 import numpy as np
 
+from backend.config import ONNX_BATCH_SIZE, ONNX_BATCH_WINDOW_MS
+
 try:
     import onnxruntime as ort
 except ImportError:
     ort = None
 
+# ONNX input element types the preprocessing can produce directly
+_ONNX_INPUT_DTYPES = {
+    "tensor(float)": np.float32,
+    "tensor(float16)": np.float16,
+    "tensor(uint8)": np.uint8,
+}
+
+# Canny/Hough/preprocessing run on the GPU when OpenCV was built with CUDA
+# and a device is present; everything else stays on the CPU either way.
+_CUDA = hasattr(cv2, "cuda") and cv2.cuda.getCudaEnabledDeviceCount() > 0
+_GPU_MAX_LINES = 4096
+
+# Per-thread scratch arrays reused across frames (see _scratch_buffer)
+_scratch = threading.local()
+
+
+def _scratch_buffer(name: str, shape: tuple, dtype=np.uint8) -> np.ndarray:
+    """This thread's reusable `name` array, reallocated only when shape/dtype change.
+
+    Thread-local because one inspector instance serves all request threads.
+    """
+    bufs = getattr(_scratch, "bufs", None)
+    if bufs is None:
+        bufs = _scratch.bufs = {}
+    arr = bufs.get(name)
+    if arr is None or arr.shape != shape or arr.dtype != dtype:
+        arr = bufs[name] = np.empty(shape, dtype)
+    return arr
+
+
+# Contour rule outcomes, indexed by OpenCVInspector._classify_contours
+_CONTOUR_DEFECT_TYPES = ("hole_shift", "ovality", "flash", "burr")
+
+# Shared worker pool for CPU-bound OpenCV stages that release the GIL
+_POOL_WORKERS = os.cpu_count() or 1
+_POOL = ThreadPoolExecutor(max_workers=_POOL_WORKERS, thread_name_prefix="inspect")
+# Below this many contours the per-task overhead outweighs the parallelism
+_PARALLEL_MIN_CONTOURS = 256
 
 # ---------------------------------------------------------------------------
 # Data types
@@ -43,33 +89,77 @@ class Defect:
     score: float = 0.0
     meta: dict = field(default_factory=dict)
 
-    def to_dict(self) -> dict:
-        # Convert numpy types to native Python for JSON serialization
-        def _native(v):
-            if isinstance(v, (np.integer,)):
-                return int(v)
-            if isinstance(v, (np.floating,)):
-                return float(v)
-            return v
-
-        return {
-            "type": self.type,
-            "bbox": [int(self.x), int(self.y), int(self.w), int(self.h)],
-            "score": round(float(self.score), 3),
-            "meta": {k: _native(v) for k, v in self.meta.items()},
-        }
+
+# Detections held column-wise: (types, (N, 4) int64 x/y/w/h bboxes,
+# (N,) float64 scores, metas).  Meta values are always native Python.
+Columns = Tuple[List[str], np.ndarray, np.ndarray, List[dict]]
+
+
+def _columns(defects: List[Defect]) -> Columns:
+    return (
+        [d.type for d in defects],
+        np.array([(d.x, d.y, d.w, d.h) for d in defects], dtype=np.int64).reshape(-1, 4),
+        np.array([d.score for d in defects], dtype=np.float64),
+        [d.meta for d in defects],
+    )
+
+
+def _scores(raw: np.ndarray) -> np.ndarray:
+    """Scores capped at 1.0; rounding happens once, in to_dicts()."""
+    return np.minimum(raw, 1.0)
 
 
 @dataclass
 class InferenceResult:
     passed: bool
-    defects: List[Defect]
+    types: List[str]
+    bboxes: np.ndarray
+    scores: np.ndarray
+    metas: List[dict]
     confidence: float
 
+    @classmethod
+    def from_columns(cls, *parts: Columns, confidence: float | None = None) -> InferenceResult:
+        """Join column sets; passes when empty, confidence defaults to 1.0 / max score."""
+        types = [t for p in parts for t in p[0]]
+        bboxes = np.concatenate([p[1] for p in parts]) if parts else np.empty((0, 4), np.int64)
+        scores = np.concatenate([p[2] for p in parts]) if parts else np.empty(0, np.float64)
+        metas = [m for p in parts for m in p[3]]
+        passed = not types
+        if confidence is None:
+            confidence = 1.0 if passed else round(float(scores.max()), 3)
+        return cls(passed, types, bboxes, scores, metas, confidence)
+
+    @classmethod
+    def from_defects(cls, defects: List[Defect], confidence: float | None = None) -> InferenceResult:
+        return cls.from_columns(_columns(defects), confidence=confidence)
+
     @property
     def result_str(self) -> str:
         return "pass" if self.passed else "fail"
 
+    def to_dicts(self) -> List[dict]:
+        """JSON-ready defects — the one place results are serialised.
+
+        Columns come out as native Python via tolist(); scores are rounded
+        here with Python's correctly rounded round(), which np.round is not.
+        """
+        return [
+            {"type": t, "bbox": bbox, "score": round(sc, 3), "meta": dict(m)}
+            for t, bbox, sc, m in zip(
+                self.types, self.bboxes.tolist(), self.scores.tolist(), self.metas,
+            )
+        ]
+
+    def rescale(self, factor: int) -> None:
+        """Map defect geometry found on a downscaled image back to full size."""
+        self.bboxes *= factor
+        for m in self.metas:
+            if "area" in m:
+                m["area"] = int(m["area"] * factor * factor)
+            if "length_px" in m:
+                m["length_px"] = round(m["length_px"] * factor, 1)
+
 
 # ---------------------------------------------------------------------------
 # OpenCV rule-based engine  (6 defect types)
@@ -110,135 +200,268 @@ class OpenCVInspector:
 
     # --- Surface marks (local texture anomalies) ---
     SURFACE_STDDEV_FACTOR = 1.8       # blocks with std > factor * global std
-
-    def inspect(self, image: np.ndarray) -> InferenceResult:
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        h_img, w_img = gray.shape[:2]
-        diag = math.sqrt(h_img ** 2 + w_img ** 2)
-        img_cx, img_cy = w_img / 2.0, h_img / 2.0
-
-        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-
-        binary = cv2.adaptiveThreshold(
-            blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-            cv2.THRESH_BINARY_INV, 11, 4,
+    SURFACE_BLOCK_SIZE = 32
+
+    # --- Working resolution ---
+    DOWNSCALE_ABOVE = 1024            # pyrDown frames whose long side exceeds this
+
+    def _limits(self, scale: int) -> SimpleNamespace:
+        """Pixel thresholds for an image downscaled by `scale` (areas by scale², lengths by scale)."""
+        a = scale * scale
+        return SimpleNamespace(
+            contour_area_min=20 / a,
+            hole_area=(self.HOLE_AREA_MIN / a, self.HOLE_AREA_MAX / a),
+            ovality_area=(self.OVALITY_AREA_MIN / a, self.OVALITY_AREA_MAX / a),
+            flash_area=(self.FLASH_AREA_MIN / a, self.FLASH_AREA_MAX / a),
+            burr_area=(self.BURR_AREA_MIN / a, self.BURR_AREA_MAX / a),
+            crack_votes=max(1, round(self.CRACK_HOU_THRESHOLD / scale)),
+            crack_min_length=self.CRACK_MIN_LINE_LENGTH / scale,
+            crack_max_gap=self.CRACK_MAX_LINE_GAP / scale,
+            block_size=max(1, self.SURFACE_BLOCK_SIZE // scale),
         )
 
-        contours, _ = cv2.findContours(
-            binary, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE,
+    # Per-resolution constants; a camera's frames all share one shape, and
+    # the bound keeps arbitrary upload sizes from growing it without limit
+    @functools.lru_cache(maxsize=32)
+    def _geometry(self, h_in: int, w_in: int) -> SimpleNamespace:
+        """Working scale, thresholds, image centre/diagonal and surface block grid for an input shape."""
+        scale = 2 if max(h_in, w_in) > self.DOWNSCALE_ABOVE else 1
+        lim = self._limits(scale)
+        # pyrDown rounds odd sizes up
+        h_img, w_img = ((h_in + 1) // 2, (w_in + 1) // 2) if scale > 1 else (h_in, w_in)
+        bs = lim.block_size
+        # Blocks start every block_size px and must start before the last
+        # block_size px of the image.
+        nby = max(0, (h_img - 1) // bs)
+        nbx = max(0, (w_img - 1) // bs)
+        return SimpleNamespace(
+            scale=scale,
+            lim=lim,
+            shape=(h_img, w_img),
+            diag=math.hypot(w_img, h_img),
+            img_cx=w_img / 2.0,
+            img_cy=h_img / 2.0,
+            corners=np.s_[:nby * bs + 1:bs, :nbx * bs + 1:bs],
         )
 
-        defects: List[Defect] = []
-
+    @staticmethod
+    def _contour_metrics(contours: list, area_min: float) -> list[tuple]:
+        """(area, perimeter, x, y, w, h, n_points) per contour; zeros below area_min."""
+        rows = []
         for cnt in contours:
             area = cv2.contourArea(cnt)
-            if area < 20:
-                continue
-
-            perimeter = cv2.arcLength(cnt, True)
-            x, y, w, h = cv2.boundingRect(cnt)
-
+            if area < area_min:
+                rows.append((area, 0.0, 0, 0, 0, 0, 0))
+            else:
+                rows.append((area, cv2.arcLength(cnt, True), *cv2.boundingRect(cnt), len(cnt)))
+        return rows
+
+    def _classify_contours(
+        self, contours: list, lim: SimpleNamespace, img_cx: float, img_cy: float, diag: float,
+    ) -> Columns:
+        """Apply the shape rules to all contours at once; first match wins, in
+        the order hole shift, ovality, flash, burr."""
+        # OpenCV releases the GIL in the contour maths, so large contour
+        # sets are measured in parallel chunks (rows keep their order)
+        if len(contours) >= _PARALLEL_MIN_CONTOURS:
+            step = -(-len(contours) // (_POOL_WORKERS * 4))
+            chunks = [contours[i:i + step] for i in range(0, len(contours), step)]
+            rows = [
+                r
+                for part in _POOL.map(
+                    lambda c: self._contour_metrics(c, lim.contour_area_min), chunks,
+                )
+                for r in part
+            ]
+        else:
+            rows = self._contour_metrics(contours, lim.contour_area_min)
+        m = np.array(rows, dtype=np.float64).reshape(-1, 7)
+        area, perim, x, y, w, h, npts = m.T
+        valid = area >= lim.contour_area_min
+
+        with np.errstate(divide="ignore", invalid="ignore"):
             # --- Hole shift: circular contour whose centre is far from image centre ---
-            if self.HOLE_AREA_MIN < area < self.HOLE_AREA_MAX and perimeter > 0:
-                circularity = 4 * math.pi * area / (perimeter * perimeter)
-                if circularity > self.HOLE_CIRCULARITY_MIN:
-                    cx, cy = x + w / 2.0, y + h / 2.0
-                    offset = math.sqrt((cx - img_cx) ** 2 + (cy - img_cy) ** 2)
-                    shift_ratio = offset / diag
-                    if shift_ratio > self.HOLE_SHIFT_RATIO:
-                        defects.append(Defect(
-                            type="hole_shift", x=x, y=y, w=w, h=h,
-                            score=round(min(shift_ratio, 1.0), 3),
-                            meta={
-                                "area": int(area),
-                                "circularity": round(circularity, 3),
-                                "shift_ratio": round(shift_ratio, 3),
-                            },
-                        ))
-                    continue  # skip further checks for circular shapes
+            circ = 4 * math.pi * area / (perim * perim)
+            circular = (valid & (lim.hole_area[0] < area) & (area < lim.hole_area[1])
+                        & (perim > 0) & (circ > self.HOLE_CIRCULARITY_MIN))
+            dx, dy = x + w / 2.0 - img_cx, y + h / 2.0 - img_cy
+            # Compare squared offsets; the root is only taken for hole scores
+            offset_sq = dx * dx + dy * dy
+            hole = circular & (offset_sq > (diag * self.HOLE_SHIFT_RATIO) ** 2)
+            shift = np.sqrt(offset_sq, out=np.zeros_like(offset_sq), where=hole) / diag
+            rest = valid & ~circular  # circular shapes skip further checks
 
             # --- Ovality: elliptical contour with high eccentricity ---
-            if len(cnt) >= 5 and self.OVALITY_AREA_MIN < area < self.OVALITY_AREA_MAX:
-                ellipse = cv2.fitEllipse(cnt)
-                (_, (ma, MA), _) = ellipse
+            ecc = np.full(len(area), np.nan)
+            for i in np.flatnonzero(
+                rest & (npts >= 5) & (lim.ovality_area[0] < area) & (area < lim.ovality_area[1])
+            ).tolist():
+                (_, (ma, MA), _) = cv2.fitEllipse(contours[i])
                 if MA > 0:
-                    eccentricity = abs(MA - ma) / MA
-                    if eccentricity > self.OVALITY_THRESHOLD:
-                        defects.append(Defect(
-                            type="ovality", x=x, y=y, w=w, h=h,
-                            score=round(min(eccentricity, 1.0), 3),
-                            meta={"eccentricity": round(eccentricity, 3)},
-                        ))
-                        continue
+                    ecc[i] = abs(MA - ma) / MA
+            oval = rest & (ecc > self.OVALITY_THRESHOLD)
+            rest &= ~oval
 
             # --- Flash: very elongated thin contour ---
-            short_side = min(w, h)
-            long_side = max(w, h)
-            if (short_side > 0
-                    and long_side / short_side > self.FLASH_ASPECT_RATIO_MIN
-                    and self.FLASH_AREA_MIN < area < self.FLASH_AREA_MAX):
-                aspect = long_side / short_side
-                defects.append(Defect(
-                    type="flash", x=x, y=y, w=w, h=h,
-                    score=round(min(aspect / 20.0, 1.0), 3),
-                    meta={"aspect_ratio": round(aspect, 2)},
-                ))
-                continue
+            short_side, long_side = np.minimum(w, h), np.maximum(w, h)
+            aspect = long_side / short_side
+            flash = (rest & (short_side > 0) & (aspect > self.FLASH_ASPECT_RATIO_MIN)
+                     & (lim.flash_area[0] < area) & (area < lim.flash_area[1]))
+            rest &= ~flash
 
             # --- Burr: small spiky contour ---
-            if self.BURR_AREA_MIN < area < self.BURR_AREA_MAX and perimeter > 0:
-                spikiness = (perimeter * perimeter) / area
-                if spikiness > self.BURR_SPIKINESS:
-                    defects.append(Defect(
-                        type="burr", x=x, y=y, w=w, h=h,
-                        score=round(min(spikiness / 1000.0, 1.0), 3),
-                        meta={"spikiness": round(spikiness, 1)},
-                    ))
-
-        # --- Crack detection (Hough line transform on edge map) ---
-        edges = cv2.Canny(blurred, 50, 150)
-        lines = cv2.HoughLinesP(
-            edges,
-            rho=1,
-            theta=np.pi / 180,
-            threshold=self.CRACK_HOU_THRESHOLD,
-            minLineLength=self.CRACK_MIN_LINE_LENGTH,
-            maxLineGap=self.CRACK_MAX_LINE_GAP,
+            spikiness = (perim * perim) / area
+            burr = (rest & (lim.burr_area[0] < area) & (area < lim.burr_area[1])
+                    & (perim > 0) & (spikiness > self.BURR_SPIKINESS))
+
+            hits = [hole, oval, flash, burr]
+            raw_scores = np.select(hits, [shift, ecc, aspect / 20.0, spikiness / 1000.0])
+
+        sel = np.flatnonzero(hole | oval | flash | burr)
+        kinds = np.select(hits, [0, 1, 2, 3])[sel].tolist()
+        area_l, circ_l, shift_l = area[sel].tolist(), circ[sel].tolist(), shift[sel].tolist()
+        ecc_l, aspect_l, spik_l = ecc[sel].tolist(), aspect[sel].tolist(), spikiness[sel].tolist()
+        metas = []
+        for j, k in enumerate(kinds):
+            if k == 0:
+                metas.append({
+                    "area": int(area_l[j]),
+                    "circularity": round(circ_l[j], 3),
+                    "shift_ratio": round(shift_l[j], 3),
+                })
+            elif k == 1:
+                metas.append({"eccentricity": round(ecc_l[j], 3)})
+            elif k == 2:
+                metas.append({"aspect_ratio": round(aspect_l[j], 2)})
+            else:
+                metas.append({"spikiness": round(spik_l[j], 1)})
+        return (
+            [_CONTOUR_DEFECT_TYPES[k] for k in kinds],
+            m[sel, 2:6].astype(np.int64),
+            _scores(raw_scores[sel]),
+            metas,
         )
-        if lines is not None:
-            for line in lines:
-                x1, y1, x2, y2 = line[0]
-                length = math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
-                bx = min(x1, x2)
-                by = min(y1, y2)
-                bw = abs(x2 - x1)
-                bh = abs(y2 - y1)
-                defects.append(Defect(
-                    type="crack", x=bx, y=by, w=bw, h=bh,
-                    score=round(min(length / diag, 1.0), 3),
-                    meta={"length_px": round(length, 1)},
-                ))
-
-        # --- Surface marks: blocks with abnormally high local std-dev ---
-        block_size = 32
-        global_std = float(np.std(gray))
+
+    def _detect_cracks(self, blurred, lim: SimpleNamespace, diag: float) -> Columns:
+        """Crack detection (Hough line transform on edge map); `blurred` may be a GpuMat."""
+        if isinstance(blurred, np.ndarray):
+            edges = _scratch_buffer("edges", blurred.shape)
+            cv2.Canny(blurred, 50, 150, edges=edges, L2gradient=False)
+            lines = cv2.HoughLinesP(
+                edges,
+                rho=1,
+                theta=np.pi / 180,
+                threshold=lim.crack_votes,
+                minLineLength=lim.crack_min_length,
+                maxLineGap=lim.crack_max_gap,
+            )
+        else:
+            edges = cv2.cuda.createCannyEdgeDetector(50, 150).detect(blurred)
+            segments = cv2.cuda.createHoughSegmentDetector(
+                1, np.pi / 180, int(lim.crack_min_length), int(lim.crack_max_gap),
+                _GPU_MAX_LINES, lim.crack_votes,
+            ).detect(edges)
+            lines = segments.download() if not segments.empty() else None
+        if lines is None:
+            return [], np.empty((0, 4), np.int64), np.empty(0, np.float64), []
+        # Geometry for every segment at once
+        x1, y1, x2, y2 = lines.reshape(-1, 4).astype(np.int64).T
+        length = np.hypot(x2 - x1, y2 - y1)
+        bboxes = np.column_stack((
+            np.minimum(x1, x2), np.minimum(y1, y2), np.abs(x2 - x1), np.abs(y2 - y1),
+        ))
+        scores = _scores(length / diag)
+        metas = [{"length_px": round(ln, 1)} for ln in length.tolist()]
+        return ["crack"] * len(metas), bboxes, scores, metas
+
+    def _detect_surface_marks(self, gray: np.ndarray, geo: SimpleNamespace) -> Columns:
+        """Surface marks: blocks with abnormally high local std-dev."""
+        h_img, w_img = geo.shape
+        # Summed-area tables give every block's sum and sum of squares from
+        # four corner lookups; float64 keeps both exact.
+        block_size = geo.lim.block_size
+        n = block_size * block_size
+        sums, sqsums = cv2.integral2(
+            gray,
+            sum=_scratch_buffer("sums", (h_img + 1, w_img + 1), np.float64),
+            sqsum=_scratch_buffer("sqsums", (h_img + 1, w_img + 1), np.float64),
+            sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F,
+        )
+        total = h_img * w_img
+        global_std = math.sqrt(max(total * sqsums[-1, -1] - sums[-1, -1] ** 2, 0.0)) / total
         threshold_std = global_std * self.SURFACE_STDDEV_FACTOR
-        for by in range(0, h_img - block_size, block_size):
-            for bx in range(0, w_img - block_size, block_size):
-                block = gray[by:by + block_size, bx:bx + block_size]
-                local_std = float(np.std(block))
-                if local_std > threshold_std and local_std > 15:
-                    defects.append(Defect(
-                        type="surface_marks",
-                        x=bx, y=by, w=block_size, h=block_size,
-                        score=round(min(local_std / 128.0, 1.0), 3),
-                        meta={"local_std": round(local_std, 2),
-                               "global_std": round(global_std, 2)},
-                    ))
-
-        passed = len(defects) == 0
-        confidence = 1.0 if passed else max(d.score for d in defects)
-        return InferenceResult(passed=passed, defects=defects, confidence=confidence)
+        s, sq = sums[geo.corners], sqsums[geo.corners]
+        s = s[1:, 1:] - s[:-1, 1:] - s[1:, :-1] + s[:-1, :-1]
+        sq = sq[1:, 1:] - sq[:-1, 1:] - sq[1:, :-1] + sq[:-1, :-1]
+        block_std = np.sqrt(np.maximum(n * sq - s * s, 0.0)) / n
+        ys, xs = np.nonzero((block_std > threshold_std) & (block_std > 15))
+        local_std = block_std[ys, xs]
+        return (
+            ["surface_marks"] * len(ys),
+            np.column_stack((
+                xs * block_size, ys * block_size,
+                np.full_like(xs, block_size), np.full_like(ys, block_size),
+            )).astype(np.int64, copy=False),
+            _scores(local_std / 128.0),
+            [{"local_std": round(v, 2), "global_std": round(global_std, 2)}
+             for v in local_std.tolist()],
+        )
+
+    @staticmethod
+    def _preprocess_gpu(image: np.ndarray, scale: int) -> tuple:
+        """Grayscale, downscale and smooth on the GPU; returns (gray, blurred, gpu_blurred)."""
+        src = cv2.cuda_GpuMat()
+        src.upload(image)
+        gray = cv2.cuda.cvtColor(src, cv2.COLOR_BGR2GRAY)
+        if scale > 1:
+            gray = cv2.cuda.pyrDown(gray)
+        blurred = cv2.cuda.createBoxFilter(cv2.CV_8UC1, cv2.CV_8UC1, (3, 3)).apply(gray)
+        # adaptiveThreshold, findContours and the integral images stay on the CPU
+        return gray.download(), blurred.download(), blurred
+
+    def inspect(self, image: np.ndarray) -> InferenceResult:
+        # Large frames are analysed at half resolution, thresholds scaled to match
+        h_in, w_in = image.shape[:2]
+        geo = self._geometry(h_in, w_in)
+        scale, lim = geo.scale, geo.lim
+
+        if _CUDA:
+            gray, blurred, edge_src = self._preprocess_gpu(image, scale)
+        else:
+            # Work in this thread's reusable buffers rather than fresh arrays
+            gray = _scratch_buffer("gray", geo.shape)
+            if scale > 1:
+                full = _scratch_buffer("full", (h_in, w_in))
+                cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=full)
+                cv2.pyrDown(full, dst=gray)
+            else:
+                cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=gray)
+            # 3x3 box smoothing + mean-C threshold: both integral-image/SIMD
+            # kernels, cheaper than a 5x5 Gaussian followed by a Gaussian-C pass
+            blurred = edge_src = _scratch_buffer("blurred", gray.shape)
+            cv2.boxFilter(gray, -1, (3, 3), dst=blurred)
+
+        # --- Cracks and surface marks run in the pool alongside the contour
+        # analysis below; the three stages only read gray/blurred ---
+        cracks = _POOL.submit(self._detect_cracks, edge_src, lim, geo.diag)
+        marks = _POOL.submit(self._detect_surface_marks, gray, geo)
+
+        binary = cv2.adaptiveThreshold(
+            blurred, 255, cv2.ADAPTIVE_THRESH_MEAN_C,
+            cv2.THRESH_BINARY_INV, 11, 4,
+            dst=_scratch_buffer("binary", gray.shape),
+        )
+
+        contours, _ = cv2.findContours(
+            binary, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE,
+        )
+
+        shapes = self._classify_contours(contours, lim, geo.img_cx, geo.img_cy, geo.diag)
+
+        result = InferenceResult.from_columns(shapes, cracks.result(), marks.result())
+        if scale > 1:
+            result.rescale(scale)
+        return result
 
 
 # ---------------------------------------------------------------------------
@@ -255,7 +478,7 @@ class ONNXInspector:
       3.  Adjust `_preprocess` and `_postprocess` for your model's I/O.
     """
 
-    def __init__(self, model_path: str):
+    def __init__(self, model_path: str, batch_size: int = 1, batch_window_s: float = 0.0):
         if ort is None:
             raise RuntimeError("onnxruntime is not installed")
         if not os.path.isfile(model_path):
@@ -263,21 +486,83 @@ class ONNXInspector:
                 f"ONNX model not found at {model_path}. "
                 "Place your model there or switch INFERENCE_MODE to 'opencv'."
             )
-        self.session = ort.InferenceSession(model_path)
-        self.input_name = self.session.get_inputs()[0].name
+        self.session = _make_session(model_path)
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.input_dtype = _ONNX_INPUT_DTYPES.get(model_input.type, np.float32)
+        self.output_names = [o.name for o in self.session.get_outputs()]
+        # Keep outputs on the device the model runs on
+        on_gpu = self.session.get_providers()[0] == "CUDAExecutionProvider"
+        self.device = "cuda" if on_gpu else "cpu"
+
+        # Concurrent calls are coalesced into one batched run, but only when
+        # the model's batch dimension is dynamic (a symbolic or None dim)
+        self.batch_size = batch_size
+        self.batch_window_s = batch_window_s
+        self._batch_queue: queue.Queue | None = None
+        if batch_size > 1 and not isinstance(model_input.shape[0], int):
+            self._batch_queue = queue.Queue()
+            threading.Thread(target=self._batch_loop, name="onnx-batch", daemon=True).start()
 
     def inspect(self, image: np.ndarray) -> InferenceResult:
-        tensor = self._preprocess(image)
-        outputs = self.session.run(None, {self.input_name: tensor})
-        return self._postprocess(outputs)
+        tensor = self._preprocess(image, self.input_dtype)
+        if self._batch_queue is None:
+            return self._postprocess(self._run(tensor))
+        fut: Future = Future()
+        self._batch_queue.put((tensor, fut))
+        return self._postprocess(fut.result())
+
+    def _run(self, tensor: np.ndarray) -> list[np.ndarray]:
+        # One binding per call: the inspector is shared across request threads
+        binding = self.session.io_binding()
+        binding.bind_cpu_input(self.input_name, tensor)
+        for name in self.output_names:
+            binding.bind_output(name, self.device)
+        self.session.run_with_iobinding(binding)
+        return binding.copy_outputs_to_cpu()
+
+    def _batch_loop(self) -> None:
+        """Collect up to batch_size queued tensors (waiting at most batch_window_s) per run."""
+        q = self._batch_queue
+        while True:
+            batch = [q.get()]
+            deadline = time.monotonic() + self.batch_window_s
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(q.get_nowait())
+                    continue
+                except queue.Empty:
+                    pass
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(q.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            try:
+                outputs = self._run(np.concatenate([t for t, _ in batch]))
+            except Exception as e:
+                for _, fut in batch:
+                    fut.set_exception(e)
+                continue
+            for i, (_, fut) in enumerate(batch):
+                fut.set_result([o[i:i + 1] for o in outputs])
 
     @staticmethod
-    def _preprocess(image: np.ndarray) -> np.ndarray:
-        """Resize + normalise to NCHW float32 — adjust for your model."""
-        img = cv2.resize(image, (224, 224))
-        img = img.astype(np.float32) / 255.0
-        img = np.transpose(img, (2, 0, 1))     # HWC -> CHW
-        return np.expand_dims(img, axis=0)      # add batch dim
+    def _preprocess(image: np.ndarray, dtype=np.float32) -> np.ndarray:
+        """
+        Resize + normalise to NCHW `dtype` — adjust for your model.
+
+        uint8 models take raw pixels (normalisation is folded into the
+        graph), so the tensor is not scaled.
+        """
+        # blobFromImage resizes, scales and lays out NCHW in one native call
+        if dtype == np.uint8:
+            return cv2.dnn.blobFromImage(image, size=(224, 224), ddepth=cv2.CV_8U)
+        blob = cv2.dnn.blobFromImage(image, 1.0 / 255.0, (224, 224))
+        return blob.astype(dtype, copy=False)
 
     @staticmethod
     def _postprocess(outputs: list) -> InferenceResult:
@@ -293,12 +578,11 @@ class ONNXInspector:
         }
 
         if predicted == 0:
-            return InferenceResult(passed=True, defects=[], confidence=float(scores[0]))
+            return InferenceResult.from_defects([], confidence=float(scores[0]))
 
         defect_type = defect_names.get(predicted, "unknown")
-        return InferenceResult(
-            passed=False,
-            defects=[Defect(type=defect_type, score=float(scores[predicted]))],
+        return InferenceResult.from_defects(
+            [Defect(type=defect_type, score=float(scores[predicted]))],
             confidence=float(scores[predicted]),
         )
 
@@ -307,7 +591,30 @@ class ONNXInspector:
 # Factory
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=4)
+def _make_session(model_path: str) -> ort.InferenceSession:
+    """Build (once per model) a fully optimised session on the best available provider."""
+    opts = ort.SessionOptions()
+    opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    opts.enable_cpu_mem_arena = True
+    opts.intra_op_num_threads = os.cpu_count() or 1
+    available = ort.get_available_providers()
+    providers = [p for p in ("CUDAExecutionProvider", "CPUExecutionProvider") if p in available]
+    return ort.InferenceSession(model_path, sess_options=opts, providers=providers)
+
+
+@functools.lru_cache(maxsize=None)
+def _onnx_inspector(model_path: str) -> ONNXInspector:
+    return ONNXInspector(model_path, ONNX_BATCH_SIZE, ONNX_BATCH_WINDOW_MS / 1000.0)
+
+
+@functools.lru_cache(maxsize=1)
+def _opencv_inspector() -> OpenCVInspector:
+    return OpenCVInspector()
+
+
 def get_inspector(mode: str = "opencv", model_path: str = ""):
+    """Return the shared inspector for `mode`, built on first use."""
     if mode == "onnx":
-        return ONNXInspector(model_path)
-    return OpenCVInspector()
+        return _onnx_inspector(model_path)
+    return _opencv_inspector()
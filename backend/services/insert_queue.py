@@ -0,0 +1,145 @@
+"""
+Inspection insert queue — group commit for the inspection write path.
+
+Handlers hand a fully-built row dict to `insert_queue.put()` and await it.
+A background task drains the queue (up to INSERT_BATCH_MAX rows, waiting at
+most INSERT_BATCH_WINDOW_MS for stragglers) and writes each batch with one
+`bulk_insert_mappings` + commit on the writer pool, so concurrent
+inspections share a single WAL commit instead of taking turns on the
+writer lock.  `put()` returns once the row is committed, so a client can
+read its inspection back as soon as the POST responds.
+"""
+from __future__ import annotations
+
+import asyncio
+
+from starlette.concurrency import run_in_threadpool
+
+from backend.config import INSERT_BATCH_MAX, INSERT_BATCH_WINDOW_MS
+from backend.database import SessionLocal
+from backend.models.db_models import Inspection
+
+
+class InsertQueue:
+    """Batches Inspection inserts from concurrent requests into one transaction."""
+
+    def __init__(self, max_batch: int, window_s: float) -> None:
+        self.max_batch = max_batch
+        self.window_s = window_s
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+
+    # ---- lifecycle ---------------------------------------------------------
+
+    def start(self) -> None:
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        # Rows still queued will never be written — release their waiters
+        while not self._queue.empty():
+            self._abandon([self._queue.get_nowait()])
+
+    @staticmethod
+    def _abandon(items: list) -> None:
+        for _, fut in items:
+            if not fut.done():
+                fut.set_exception(RuntimeError("insert queue stopped before the row was written"))
+
+    # ---- public API --------------------------------------------------------
+
+    async def put(self, row: dict) -> None:
+        """Queue one Inspection row and wait until it is committed."""
+        await self.put_many([row])
+
+    async def put_many(self, rows: list[dict]) -> None:
+        """Queue several rows and wait until all of them are committed."""
+        self.start()
+        loop = asyncio.get_running_loop()
+        futures = []
+        for row in rows:
+            fut = loop.create_future()
+            self._queue.put_nowait((row, fut))
+            futures.append(fut)
+        await asyncio.gather(*futures)
+
+    # ---- worker ------------------------------------------------------------
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window_s
+            try:
+                while len(batch) < self.max_batch:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                        continue
+                    except asyncio.QueueEmpty:
+                        pass
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                self._abandon(batch)  # stopped while still collecting
+                raise
+
+            try:
+                errors = await run_in_threadpool(self._write, [row for row, _ in batch])
+            except BaseException as e:  # includes cancellation on shutdown
+                errors = [e] * len(batch)
+            for (_, fut), error in zip(batch, errors):
+                if fut.done():
+                    continue  # requester went away
+                if error is None:
+                    fut.set_result(None)
+                elif isinstance(error, asyncio.CancelledError):
+                    fut.cancel()
+                else:
+                    fut.set_exception(error)
+            if errors and isinstance(errors[0], asyncio.CancelledError):
+                raise errors[0]
+
+    @staticmethod
+    def _write(rows: list[dict]) -> list[BaseException | None]:
+        """Insert rows in one transaction; returns one error (or None) per row.
+
+        If the batch fails, its rows are retried one transaction each, so
+        only the offending row's request sees the error.
+        """
+        with SessionLocal() as db:
+            try:
+                db.bulk_insert_mappings(Inspection, rows)
+                db.commit()
+                return [None] * len(rows)
+            except Exception:
+                db.rollback()
+                if len(rows) == 1:
+                    raise
+            errors: list[BaseException | None] = []
+            for row in rows:
+                try:
+                    db.bulk_insert_mappings(Inspection, [row])
+                    db.commit()
+                    errors.append(None)
+                except Exception as e:
+                    db.rollback()
+                    errors.append(e)
+            return errors
+
+
+# Module-level convenience instance
+insert_queue = InsertQueue(INSERT_BATCH_MAX, INSERT_BATCH_WINDOW_MS / 1000.0)
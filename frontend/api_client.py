@@ -3,19 +3,89 @@ Thin HTTP helper shared by all Streamlit pages.
 """
 from __future__ import annotations
 
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import pybase64 as base64  # SIMD decoder, same API as the stdlib module
+except ImportError:
+    import base64
+
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+# One pooled session for every call, so pages reuse keep-alive (and TLS)
+# connections instead of opening a new one per request.  Only idempotent
+# methods are retried, and only on gateway errors.
+_session = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    # raise_on_status=False hands the last 5xx back to raise_for_status()
+    max_retries=Retry(
+        total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504], raise_on_status=False,
+    ),
+)
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
+
+
+def _json(r: requests.Response):
+    """Decode a response body with orjson when available (bytes in, no text decode)."""
+    return _loads(r.content)
 
 
 def api_url() -> str:
     return st.session_state.get("api_url", "http://localhost:8000")
 
 
-def get(path: str, params: dict | None = None):
+# Reruns re-fetch the same lists on every widget interaction, so JSON GETs
+# are served from a short-lived cache.  Errors raise out of the cached
+# function and are therefore never cached; mutations clear it.
+GET_CACHE_TTL = 5
+# Upper bound for a per-call ttl; also how long stale entries can linger
+_GET_CACHE_MAX_TTL = 60
+
+
+@st.cache_data(ttl=_GET_CACHE_MAX_TTL, max_entries=256, show_spinner=False)
+def _cached_get(base_url: str, path: str, params: tuple, bucket: int):
+    # `bucket` only keys the cache: a new one starts every `ttl` seconds
+    r = _session.get(f"{base_url}{path}", params=dict(params) or None, timeout=10)
+    r.raise_for_status()
+    return _json(r)
+
+
+def _bucket(ttl: float) -> int:
+    return int(time.monotonic() // min(ttl, _GET_CACHE_MAX_TTL))
+
+
+def get(path: str, params: dict | None = None, ttl: float = GET_CACHE_TTL):
+    """Cached JSON GET; `ttl` (at most 60 s) is how long a response may be reused."""
     try:
-        r = requests.get(f"{api_url()}{path}", params=params, timeout=10)
+        return _cached_get(
+            api_url(), path, tuple(sorted((params or {}).items())), _bucket(ttl),
+        )
+    except requests.exceptions.ConnectionError:
+        st.error("Cannot reach the API server. Is the backend running?")
+        return None
+    except requests.exceptions.HTTPError as e:
+        st.error(f"API error: {e.response.status_code} — {e.response.text}")
+        return None
+
+
+def get_bytes(path: str, params: dict | None = None):
+    """GET a binary resource (e.g. a JPEG image); returns the raw bytes."""
+    try:
+        r = _session.get(f"{api_url()}{path}", params=params, timeout=10)
         r.raise_for_status()
-        return r.json()
+        return r.content
     except requests.exceptions.ConnectionError:
         st.error("Cannot reach the API server. Is the backend running?")
         return None
@@ -24,11 +94,60 @@ def get(path: str, params: dict | None = None):
         return None
 
 
-def post(path: str, json: dict | None = None, params: dict | None = None):
+def _fetch_image(base_url: str, inspection_id: str, size: str | None) -> bytes | None:
+    """Worker-thread GET: no st.* calls (there is no script context), None on failure."""
+    params = {"encoding": "base64"} | ({"size": size} if size else {})
+    try:
+        r = _session.get(f"{base_url}/inspections/{inspection_id}/image", params=params, timeout=10)
+        r.raise_for_status()
+        return base64.b64decode(_json(r)["image_base64"])
+    except (requests.exceptions.RequestException, ValueError, KeyError):
+        return None
+
+
+_IMAGES_CHUNK = 100  # ids per /inspections/images call
+
+
+def get_images(ids: list[str], size: str | None = None) -> dict[str, bytes]:
+    """
+    Stored images for several inspections, as {id: bytes}; size="thumb"
+    asks for small JPEG previews instead of the originals.
+
+    Uses the batch endpoint; against a backend without it, falls back to
+    per-image GETs issued concurrently, asking for the base64 JSON body
+    every backend version serves.  Missing images are left out.
+    """
+    if not ids:
+        return {}
+    base = api_url()
+    size_param = (("size", size),) if size else ()
+    images = {}
+    try:
+        # Chunked so every URL stays short and under the backend's id limit
+        for start in range(0, len(ids), _IMAGES_CHUNK):
+            params = (("ids", ",".join(ids[start:start + _IMAGES_CHUNK])),) + size_param
+            encoded = _cached_get(base, "/inspections/images", params, _bucket(GET_CACHE_TTL))
+            images.update((i, base64.b64decode(b64)) for i, b64 in encoded.items())
+        return images
+    except requests.exceptions.ConnectionError:
+        st.error("Cannot reach the API server. Is the backend running?")
+        return {}
+    except requests.exceptions.HTTPError as e:
+        # An older backend takes "images" as an inspection id and 404s
+        if e.response.status_code != 404:
+            st.error(f"API error: {e.response.status_code} — {e.response.text}")
+            return {}
+    with ThreadPoolExecutor(max_workers=16) as ex:
+        contents = ex.map(lambda i: _fetch_image(base, i, size), ids)
+        return {i: c for i, c in zip(ids, contents) if c is not None}
+
+
+def post(path: str, json: dict | None = None, params: dict | None = None, files: dict | None = None):
     try:
-        r = requests.post(f"{api_url()}{path}", json=json, params=params, timeout=30)
+        r = _session.post(f"{api_url()}{path}", json=json, params=params, files=files, timeout=30)
         r.raise_for_status()
-        return r.json()
+        _cached_get.clear()
+        return _json(r)
     except requests.exceptions.ConnectionError:
         st.error("Cannot reach the API server. Is the backend running?")
         return None
@@ -37,11 +156,12 @@ def post(path: str, json: dict | None = None, params: dict | None = None):
         return None
 
 
-def patch(path: str, json: dict | None = None):
+def patch(path: str, json: dict | list | None = None):
     try:
-        r = requests.patch(f"{api_url()}{path}", json=json, timeout=10)
+        r = _session.patch(f"{api_url()}{path}", json=json, timeout=10)
         r.raise_for_status()
-        return r.json()
+        _cached_get.clear()
+        return _json(r)
     except requests.exceptions.ConnectionError:
         st.error("Cannot reach the API server. Is the backend running?")
         return None
@@ -52,8 +172,9 @@ def patch(path: str, json: dict | None = None):
 
 def delete(path: str):
     try:
-        r = requests.delete(f"{api_url()}{path}", timeout=10)
+        r = _session.delete(f"{api_url()}{path}", timeout=10)
         r.raise_for_status()
+        _cached_get.clear()
         return True
     except requests.exceptions.ConnectionError:
         st.error("Cannot reach the API server. Is the backend running?")
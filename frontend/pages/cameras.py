@@ -1,10 +1,8 @@
 """Cameras page — add/edit/delete cameras, set ROI, live preview."""
 from __future__ import annotations
 
-import base64
-
 import streamlit as st
-from api_client import get, post, patch, delete
+from api_client import get, get_bytes, post, patch, delete
 
 
 def render():
@@ -66,9 +64,8 @@ def render():
 
         with col_actions:
             if st.button("Snapshot", key=f"snap_{cam_id}"):
-                snap = get(f"/cameras/{cam_id}/snapshot")
-                if snap:
-                    img_bytes = base64.b64decode(snap["image_base64"])
+                img_bytes = get_bytes(f"/cameras/{cam_id}/snapshot")
+                if img_bytes:
                     st.image(img_bytes, caption=f"Live — {cam['name']}", use_container_width=True)
 
             if st.button("Delete", key=f"del_{cam_id}"):
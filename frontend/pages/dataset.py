@@ -1,10 +1,8 @@
 """Dataset Capture page — bulk capture images for training data collection."""
 from __future__ import annotations
 
-import base64
-
 import streamlit as st
-from api_client import get, post, patch
+from api_client import get, get_bytes, post
 
 
 def render():
@@ -37,25 +35,18 @@ def render():
     default_label = st.radio("Default label", ["", "ok", "ng"], horizontal=True)
 
     if st.button("Capture", type="primary"):
-        progress = st.progress(0)
-        captured_ids = []
-        for i in range(n_captures):
-            result = post("/inspections", params={
+        # One call captures, inspects and labels all frames server-side
+        with st.spinner(f"Capturing {n_captures} image(s)…"):
+            results = post("/inspections/bulk", params={
                 "camera_id": cam_id,
                 "mode": "opencv",
+                "n": n_captures,
+                "label": default_label,
             })
-            if result:
-                captured_ids.append(result["id"])
-                # Apply default label if set
-                if default_label:
-                    patch(
-                        f"/inspections/{result['id']}/label",
-                        json={"label": default_label},
-                    )
-            progress.progress((i + 1) / n_captures)
-
-        st.success(f"Captured {len(captured_ids)} image(s).")
-        st.session_state["last_captured"] = captured_ids
+        if results:
+            captured_ids = [r["id"] for r in results]
+            st.success(f"Captured {len(captured_ids)} image(s).")
+            st.session_state["last_captured"] = captured_ids
 
     # --- Show last captured ---
     captured_ids = st.session_state.get("last_captured", [])
@@ -65,9 +56,8 @@ def render():
         cols = st.columns(min(len(captured_ids), 4))
         for idx, insp_id in enumerate(captured_ids):
             col = cols[idx % len(cols)]
-            img_resp = get(f"/inspections/{insp_id}/image")
-            if img_resp:
-                img_bytes = base64.b64decode(img_resp["image_base64"])
+            img_bytes = get_bytes(f"/inspections/{insp_id}/image")
+            if img_bytes:
                 col.image(img_bytes, caption=str(insp_id)[:8], use_container_width=True)
 
     st.divider()
@@ -1,11 +1,9 @@
 """Inspect page — live preview, capture + run inference, show results."""
 from __future__ import annotations
 
-import base64
-import time
-
 import streamlit as st
-from api_client import get, post
+import streamlit.components.v1 as components
+from api_client import api_url, get, get_bytes, post
 
 
 def render():
@@ -30,22 +28,24 @@ def render():
 
     col_preview, col_result = st.columns(2)
 
-    # --- Live preview (polling) ---
+    # --- Live preview ---
     with col_preview:
         st.subheader("Live Preview")
-        preview_placeholder = st.empty()
-        auto_refresh = st.checkbox("Auto-refresh preview", value=False)
+        live = st.checkbox("Live stream", value=False)
 
-        snap = get(f"/cameras/{cam_id}/snapshot")
-        if snap:
-            img_bytes = base64.b64decode(snap["image_base64"])
-            preview_placeholder.image(img_bytes, caption="Live", use_container_width=True)
+        if live:
+            # The browser pulls the MJPEG stream itself — no script reruns
+            components.html(
+                f'<img src="{api_url()}/cameras/{cam_id}/stream" '
+                f'style="width:100%" alt="Live stream">',
+                height=400,
+            )
         else:
-            preview_placeholder.info("Could not get snapshot.")
-
-        if auto_refresh:
-            time.sleep(1)
-            st.rerun()
+            img_bytes = get_bytes(f"/cameras/{cam_id}/snapshot")
+            if img_bytes:
+                st.image(img_bytes, caption="Snapshot", use_container_width=True)
+            else:
+                st.info("Could not get snapshot.")
 
     # --- Inspect ---
     with col_result:
@@ -76,7 +76,6 @@ def render():
                         )
 
                 # Show captured image
-                img_resp = get(f"/inspections/{result['id']}/image")
-                if img_resp:
-                    img_bytes = base64.b64decode(img_resp["image_base64"])
+                img_bytes = get_bytes(f"/inspections/{result['id']}/image")
+                if img_bytes:
                     st.image(img_bytes, caption="Captured Image", use_container_width=True)
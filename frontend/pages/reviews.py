@@ -1,10 +1,71 @@
 """Reviews page — browse past inspections, filter, view image evidence."""
 from __future__ import annotations
 
-import base64
-
 import streamlit as st
-from api_client import get, patch
+from api_client import get, get_images, patch
+
+
+# Cameras rarely change, so their list may be reused for longer than the
+# default; any write through api_client clears both lists.
+def _camera_options() -> dict:
+    """Camera filter options, name -> id, with "All" first."""
+    cameras = get("/cameras", ttl=60) or []
+    return {"All": None} | {c["name"]: c["id"] for c in cameras}
+
+
+def _label(inspection_id: str, label: str) -> None:
+    """Button callback — queue the label; _save_labels() sends the batch."""
+    st.session_state.setdefault("pending_labels", {})[inspection_id] = label
+
+
+def _save_labels() -> None:
+    pending = st.session_state.get("pending_labels", {})
+    if not pending:
+        return
+    items = [{"id": iid, "label": label} for iid, label in pending.items()]
+    if patch("/inspections/labels", json=items) is not None:
+        pending.clear()
+
+
+@st.fragment
+def _card(insp: dict, img_bytes: bytes | None) -> None:
+    """One inspection; its label buttons rerun only this card."""
+    with st.container():
+        c1, c2 = st.columns([1, 2])
+
+        with c1:
+            if img_bytes:
+                st.image(img_bytes, use_container_width=True)
+
+        with c2:
+            result_color = "green" if insp["result"] == "pass" else "red"
+            st.markdown(f"### :{result_color}[{insp['result'].upper()}]")
+            st.write(f"**Camera:** `{insp['camera_id'][:8]}…`")
+            st.write(f"**Confidence:** {insp['confidence']:.3f}")
+            st.write(f"**Mode:** {insp['inference_mode']}")
+            st.write(f"**Time:** {insp['created_at']}")
+
+            if insp["defects"]:
+                st.write("**Defects:**")
+                for d in insp["defects"]:
+                    st.write(f"- {d['type']} (score {d['score']})")
+
+            # Label buttons
+            current_label = insp.get("label", "")
+            pending = st.session_state.get("pending_labels", {})
+            if insp["id"] in pending:
+                st.write(f"**Manual Label:** {pending[insp['id']]} *(unsaved)*")
+            else:
+                st.write(f"**Manual Label:** {current_label or '—'}")
+            lc1, lc2 = st.columns(2)
+            lc1.button(
+                "Label OK", key=f"ok_{insp['id']}", on_click=_label, args=(insp["id"], "ok"),
+            )
+            lc2.button(
+                "Label NG", key=f"ng_{insp['id']}", on_click=_label, args=(insp["id"], "ng"),
+            )
+
+        st.divider()
 
 
 def render():
@@ -12,8 +73,7 @@ def render():
 
     # --- Filters ---
     fc1, fc2, fc3 = st.columns(3)
-    cameras = get("/cameras") or []
-    cam_options = {"All": None} | {c["name"]: c["id"] for c in cameras}
+    cam_options = _camera_options()
     sel_cam_name = fc1.selectbox("Camera", list(cam_options.keys()))
     sel_result = fc2.selectbox("Result", ["All", "pass", "fail"])
     limit = fc3.number_input("Limit", min_value=1, max_value=500, value=50)
@@ -24,48 +84,21 @@ def render():
     if sel_result != "All":
         params["result"] = sel_result
 
-    inspections = get("/inspections", params=params)
+    inspections = get("/inspections", params=params, ttl=15)
     if inspections is None:
         return
     if not inspections:
         st.info("No inspections found.")
         return
 
-    st.write(f"Showing **{len(inspections)}** inspection(s).")
+    sc1, sc2 = st.columns([3, 1])
+    sc1.write(f"Showing **{len(inspections)}** inspection(s).")
+    # Card reruns don't redraw this button, so it can't show a live count
+    sc2.button("Save labels", type="primary", on_click=_save_labels)
     st.divider()
 
+    # All images in one round-trip instead of one request per card
+    images = get_images([i["id"] for i in inspections], size="thumb")
+
     for insp in inspections:
-        with st.container():
-            c1, c2 = st.columns([1, 2])
-
-            with c1:
-                img_resp = get(f"/inspections/{insp['id']}/image")
-                if img_resp:
-                    img_bytes = base64.b64decode(img_resp["image_base64"])
-                    st.image(img_bytes, use_container_width=True)
-
-            with c2:
-                result_color = "green" if insp["result"] == "pass" else "red"
-                st.markdown(f"### :{result_color}[{insp['result'].upper()}]")
-                st.write(f"**Camera:** `{insp['camera_id'][:8]}…`")
-                st.write(f"**Confidence:** {insp['confidence']:.3f}")
-                st.write(f"**Mode:** {insp['inference_mode']}")
-                st.write(f"**Time:** {insp['created_at']}")
-
-                if insp["defects"]:
-                    st.write("**Defects:**")
-                    for d in insp["defects"]:
-                        st.write(f"- {d['type']} (score {d['score']})")
-
-                # Label buttons
-                current_label = insp.get("label", "")
-                st.write(f"**Manual Label:** {current_label or '—'}")
-                lc1, lc2 = st.columns(2)
-                if lc1.button("Label OK", key=f"ok_{insp['id']}"):
-                    patch(f"/inspections/{insp['id']}/label", json={"label": "ok"})
-                    st.rerun()
-                if lc2.button("Label NG", key=f"ng_{insp['id']}"):
-                    patch(f"/inspections/{insp['id']}/label", json={"label": "ng"})
-                    st.rerun()
-
-            st.divider()
+        _card(insp, images.get(insp["id"]))
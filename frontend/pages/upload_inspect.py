@@ -1,15 +1,13 @@
 """Upload & Inspect page — upload an image, run defect inspection, show tabular results."""
 from __future__ import annotations
 
-import base64
 import io
 
-import requests
+import numpy as np
+import pandas as pd
 import streamlit as st
-
-
-def _api_url() -> str:
-    return st.session_state.get("api_url", "http://localhost:8000")
+from PIL import Image
+from api_client import get_bytes, post
 
 
 # Friendly display names for each defect type
@@ -24,6 +22,51 @@ DEFECT_LABELS = {
 
 ALL_DEFECT_TYPES = list(DEFECT_LABELS.keys())
 
+BBOX_FORMAT = "x={}, y={}, w={}, h={}".format
+
+# Cell styles for the summary table's Status column
+STATUS_CSS = {
+    "DETECTED": "background-color: #ffcccc; color: #cc0000; font-weight: bold",
+    "OK": "background-color: #ccffcc; color: #007700; font-weight: bold",
+}
+
+PREVIEW_MAX_DIM = 512
+
+
+def _preview(uploaded_file) -> bytes:
+    """Small JPEG of the upload for display, made once per file and kept in session state."""
+    if st.session_state.get("preview_id") != uploaded_file.file_id:
+        uploaded_file.seek(0)
+        box = (PREVIEW_MAX_DIM, PREVIEW_MAX_DIM)
+        with Image.open(uploaded_file) as im:
+            im.draft("RGB", box)
+            img = im.convert("RGB")
+        img.thumbnail(box)
+        buf = io.BytesIO()
+        img.save(buf, "JPEG", quality=80)
+        st.session_state["preview_bytes"] = buf.getvalue()
+        st.session_state["preview_id"] = uploaded_file.file_id
+    return st.session_state["preview_bytes"]
+
+
+# An inspection's defects never change, so its id alone is the cache key
+# (the leading underscore keeps Streamlit from hashing the defect list).
+@st.cache_data(max_entries=32, show_spinner=False)
+def _detail_df(inspection_id: str, _defects: list) -> pd.DataFrame:
+    return pd.DataFrame.from_records(
+        [
+            (
+                i,
+                DEFECT_LABELS.get(d["type"], d["type"]),
+                f"{d['score']:.3f}",
+                BBOX_FORMAT(*d["bbox"]),
+                ", ".join(f"{k}={v}" for k, v in meta.items()) if (meta := d.get("meta")) else "",
+            )
+            for i, d in enumerate(_defects, 1)
+        ],
+        columns=["#", "Type", "Score", "Bounding Box", "Details"],
+    )
+
 
 def render():
     st.header("Upload & Inspect")
@@ -45,31 +88,32 @@ def render():
     col_img, col_result = st.columns([1, 1])
     with col_img:
         st.subheader("Uploaded Image")
-        st.image(uploaded_file, use_container_width=True)
+        st.image(_preview(uploaded_file), use_container_width=True)
 
     # Run inspection on button click
     with col_result:
         st.subheader("Inspection")
         if st.button("Run Inspection", type="primary"):
-            uploaded_file.seek(0)
-            with st.spinner("Analysing image for defects..."):
-                try:
-                    resp = requests.post(
-                        f"{_api_url()}/inspections/upload",
-                        files={"file": (uploaded_file.name, uploaded_file.getvalue(), uploaded_file.type)},
+            # Each upload gets a fresh file_id, so repeat clicks on the same
+            # file reuse its result instead of re-posting and re-inspecting
+            result = None
+            if st.session_state.get("upload_result_id") == uploaded_file.file_id:
+                result = st.session_state.get("upload_result")
+            if result is None:
+                # Rewind (the preview may have read it) and hand requests the file
+                # object itself, rather than a getvalue() copy of its bytes
+                uploaded_file.seek(0)
+                with st.spinner("Analysing image for defects..."):
+                    result = post(
+                        "/inspections/upload",
+                        files={"file": (uploaded_file.name, uploaded_file, uploaded_file.type)},
                         params={"mode": "opencv"},
-                        timeout=30,
                     )
-                    resp.raise_for_status()
-                    result = resp.json()
-                except requests.exceptions.ConnectionError:
-                    st.error("Cannot reach the API server. Is the backend running?")
-                    return
-                except requests.exceptions.HTTPError as e:
-                    st.error(f"API error: {e.response.status_code} — {e.response.text}")
+                if result is None:
                     return
 
             st.session_state["upload_result"] = result
+            st.session_state["upload_result_id"] = uploaded_file.file_id
 
     # --- Display results ---
     result = st.session_state.get("upload_result")
@@ -95,65 +139,41 @@ def render():
 
     defects = result.get("defects", [])
 
-    # Group defects by type
-    from collections import Counter
-    type_counts = Counter(d["type"] for d in defects)
-
-    # Build table rows — one per defect category
-    table_rows = []
-    for dtype in ALL_DEFECT_TYPES:
-        count = type_counts.get(dtype, 0)
-        status = "DETECTED" if count > 0 else "OK"
-        # Best (highest) score for this type
-        scores = [d["score"] for d in defects if d["type"] == dtype]
-        max_score = max(scores) if scores else 0.0
-        table_rows.append({
-            "Defect Type": DEFECT_LABELS[dtype],
-            "Status": status,
-            "Count": count,
-            "Max Score": f"{max_score:.3f}" if count > 0 else "—",
-        })
+    # Count and best (highest) score per defect type in one groupby; types
+    # with no defects are filled in as zero rows
+    agg = (
+        pd.DataFrame(defects, columns=["type", "score"])
+        .groupby("type")["score"]
+        .agg(count="count", max_score="max")
+        .reindex(ALL_DEFECT_TYPES, fill_value=0)
+    )
+    detected = agg["count"].to_numpy() > 0
 
     # Render as a Streamlit table with colour coding
-    import pandas as pd
-    df = pd.DataFrame(table_rows)
-
-    def _highlight_status(val):
-        if val == "DETECTED":
-            return "background-color: #ffcccc; color: #cc0000; font-weight: bold"
-        elif val == "OK":
-            return "background-color: #ccffcc; color: #007700; font-weight: bold"
-        return ""
-
-    styled = df.style.applymap(_highlight_status, subset=["Status"])
+    df = pd.DataFrame({
+        "Defect Type": [DEFECT_LABELS[t] for t in ALL_DEFECT_TYPES],
+        "Status": np.where(detected, "DETECTED", "OK"),
+        "Count": agg["count"].to_numpy(dtype=int),
+        "Max Score": np.where(detected, agg["max_score"].map("{:.3f}".format), "—"),
+    })
+
+    # Whole-column lookup instead of a Python callback per cell
+    styled = df.style.apply(lambda col: col.map(STATUS_CSS).fillna(""), subset=["Status"])
     st.dataframe(styled, use_container_width=True, hide_index=True)
 
     # --- Detailed defect list ---
     if defects:
         st.divider()
-        st.subheader("Detailed Defect List")
-
-        detail_rows = []
-        for i, d in enumerate(defects, 1):
-            detail_rows.append({
-                "#": i,
-                "Type": DEFECT_LABELS.get(d["type"], d["type"]),
-                "Score": f"{d['score']:.3f}",
-                "Bounding Box": f"x={d['bbox'][0]}, y={d['bbox'][1]}, w={d['bbox'][2]}, h={d['bbox'][3]}",
-                "Details": ", ".join(f"{k}={v}" for k, v in d.get("meta", {}).items()),
-            })
-
-        df_detail = pd.DataFrame(detail_rows)
-        st.dataframe(df_detail, use_container_width=True, hide_index=True)
+        with st.expander(f"Detailed Defect List ({len(defects)})"):
+            st.dataframe(
+                _detail_df(result["id"], defects), use_container_width=True, hide_index=True,
+            )
 
     # Show the saved inspection image from backend
     st.divider()
     st.subheader("Stored Evidence")
-    try:
-        img_resp = requests.get(f"{_api_url()}/inspections/{result['id']}/image", timeout=10)
-        img_resp.raise_for_status()
-        img_data = img_resp.json()
-        img_bytes = base64.b64decode(img_data["image_base64"])
+    img_bytes = get_bytes(f"/inspections/{result['id']}/image")
+    if img_bytes:
         st.image(img_bytes, caption=f"Inspection {result['id'][:8]}…", use_container_width=True)
-    except Exception:
+    else:
         st.info("Could not load stored evidence image.")
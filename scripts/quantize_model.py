@@ -0,0 +1,85 @@
+"""
+Quantise the ONNX defect model to INT8 for CPU inference.
+
+Runs ONNX Runtime static quantisation (QDQ format, int8 weights, uint8
+activations) and calibrates activation ranges on inspection images the
+service has already stored, preprocessed exactly as ONNXInspector does.
+The quantised model keeps the original float input, so point
+ONNX_MODEL_PATH at it without any other change.
+
+Usage (from the repo root; needs the `onnx` package as well):
+
+    python scripts/quantize_model.py [--model PATH] [--output PATH] [--samples N]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import cv2  # noqa: E402
+import onnxruntime as ort  # noqa: E402
+from onnxruntime.quantization import (  # noqa: E402
+    CalibrationDataReader, QuantFormat, QuantType, quantize_static,
+)
+
+from backend.config import IMAGE_STORAGE_PATH, ONNX_MODEL_PATH  # noqa: E402
+from backend.services.inference import ONNXInspector  # noqa: E402
+
+
+class StoredImageReader(CalibrationDataReader):
+    """Feeds stored inspection images to the calibrator, one per call."""
+
+    def __init__(self, input_name: str, paths: list[Path]):
+        self.input_name = input_name
+        self._paths = iter(paths)
+
+    def get_next(self) -> dict | None:
+        for path in self._paths:
+            img = cv2.imread(str(path))
+            if img is not None:
+                return {self.input_name: ONNXInspector._preprocess(img)}
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--model", default=ONNX_MODEL_PATH)
+    parser.add_argument("--output", help="default: <model>.int8.onnx")
+    parser.add_argument("--images", default=str(IMAGE_STORAGE_PATH))
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument(
+        "--reduce-range", action="store_true",
+        help="7-bit weights; more accurate on CPUs without VNNI",
+    )
+    args = parser.parse_args()
+
+    model = Path(args.model)
+    output = Path(args.output) if args.output else model.with_suffix(".int8.onnx")
+    paths = sorted(
+        p for p in Path(args.images).iterdir()
+        if p.suffix.lower() in (".jpg", ".jpeg", ".png", ".bmp")
+    )[-args.samples:]
+    if not paths:
+        sys.exit(f"No calibration images found in {args.images}")
+
+    input_name = ort.InferenceSession(
+        str(model), providers=["CPUExecutionProvider"],
+    ).get_inputs()[0].name
+
+    quantize_static(
+        str(model),
+        str(output),
+        StoredImageReader(input_name, paths),
+        quant_format=QuantFormat.QDQ,
+        weight_type=QuantType.QInt8,
+        activation_type=QuantType.QUInt8,
+        reduce_range=args.reduce_range,
+    )
+    print(f"Calibrated on {len(paths)} images -> {output}")
+
+
+if __name__ == "__main__":
+    main()